@@ -8,10 +8,13 @@ import traceback
 from pathlib import Path
 
 import discord
+from discord import app_commands
 from discord.ext import commands
 
-from utils.logger import get_logger
+from utils.logger import get_logger, truncate_traceback
 from utils.message_formatter import EmbedFormatter
+from utils.command_sync import sync_command_tree
+from utils.write_queue import WriteBehindQueue
 from database import database
 from config import config
 
@@ -38,6 +41,9 @@ class DiscordQABot:
             case_insensitive=True
         )
         
+        # 待写入数据库的错误日志（由后台任务批量写入，避免阻塞错误响应）
+        self._error_logs = WriteBehindQueue("错误日志", database.log_errors_bulk, max_size=10000)
+        
         # 注册事件处理器
         self._setup_events()
     
@@ -58,10 +64,11 @@ class DiscordQABot:
             )
             await self.bot.change_presence(activity=activity)
             
-            # 同步斜杠命令
+            # 同步斜杠命令（命令树未变化时跳过，可用sync命令强制同步）
             try:
-                synced = await self.bot.tree.sync()
-                self.logger.info(f"同步了 {len(synced)} 个斜杠命令")
+                synced = await sync_command_tree(self.bot, guild_id=config.DEV_GUILD_ID)
+                if synced is not None:
+                    self.logger.info(f"同步了 {synced} 个斜杠命令")
             except Exception as e:
                 self.logger.error(f"同步斜杠命令失败: {e}")
         
@@ -73,12 +80,12 @@ class DiscordQABot:
             # 查找系统频道发送欢迎消息
             if guild.system_channel:
                 try:
-                    embed = EmbedFormatter.create_help_embed()
+                    embed = EmbedFormatter.clone_help_embed()
                     embed.title = "👋 感谢邀请SillyTavern问答机器人！"
                     embed.description = "我是专门为SillyTavern用户提供技术支持的AI助手。"
                     
                     await guild.system_channel.send(embed=embed)
-                except:
+                except (discord.Forbidden, discord.HTTPException):
                     pass  # 如果无权限发送消息就跳过
         
         @self.bot.event
@@ -93,18 +100,17 @@ class DiscordQABot:
                 return  # 忽略未知命令
             
             if isinstance(error, commands.MissingPermissions):
-                embed = EmbedFormatter.create_error_embed(
-                    "您没有足够的权限使用此命令。",
-                    title="权限不足",
+                embed = EmbedFormatter.clone_error_embed(
+                    "权限不足",
                     user_name=ctx.author.display_name
                 )
                 await ctx.send(embed=embed)
                 return
             
             if isinstance(error, commands.BadArgument):
-                embed = EmbedFormatter.create_error_embed(
+                embed = EmbedFormatter.clone_error_embed(
+                    "参数错误",
                     f"命令参数错误: {str(error)}",
-                    title="参数错误",
                     user_name=ctx.author.display_name
                 )
                 await ctx.send(embed=embed)
@@ -112,20 +118,20 @@ class DiscordQABot:
             
             # 记录未处理的错误
             self.logger.error(f"命令错误: {error}")
-            self.logger.error(traceback.format_exc())
+            tb = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+            self.logger.error(tb)
             
             # 记录错误到数据库
-            await database.log_error(
+            self._queue_error_log(
                 error_type="command_error",
                 error_message=str(error),
                 user_id=ctx.author.id,
                 channel_id=ctx.channel.id,
-                traceback=traceback.format_exc()
+                traceback=tb
             )
             
-            embed = EmbedFormatter.create_error_embed(
-                "执行命令时发生了意外错误，请稍后再试。",
-                title="系统错误",
+            embed = EmbedFormatter.clone_error_embed(
+                "系统错误",
                 user_name=ctx.author.display_name
             )
             await ctx.send(embed=embed)
@@ -133,36 +139,78 @@ class DiscordQABot:
         @self.bot.event
         async def on_app_command_error(interaction, error):
             """应用命令（斜杠命令）错误处理"""
+            command = interaction.command
+            if command is not None and command._has_any_error_handlers():
+                return  # 已由命令或所属Cog的错误处理器处理
+            
+            if isinstance(error, app_commands.CommandOnCooldown):
+                # 冷却中属于正常的限流提示，不记录错误日志
+                embed = EmbedFormatter.clone_error_embed(
+                    "命令冷却中",
+                    f"请在 {error.retry_after:.1f} 秒后再试。",
+                    user_name=interaction.user.display_name
+                )
+                await self._send_interaction_error(interaction, embed)
+                return
+            
+            if isinstance(error, app_commands.CheckFailure):
+                # 权限检查未通过，不记录错误日志
+                embed = EmbedFormatter.clone_error_embed(
+                    "权限不足",
+                    user_name=interaction.user.display_name
+                )
+                await self._send_interaction_error(interaction, embed)
+                return
+            
             self.logger.error(f"斜杠命令错误: {error}")
-            self.logger.error(traceback.format_exc())
+            tb = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+            self.logger.error(tb)
             
             # 记录错误到数据库
-            await database.log_error(
+            self._queue_error_log(
                 error_type="app_command_error",
                 error_message=str(error),
                 user_id=interaction.user.id,
                 channel_id=interaction.channel.id if interaction.channel else None,
-                traceback=traceback.format_exc()
+                traceback=tb
             )
             
-            embed = EmbedFormatter.create_error_embed(
+            embed = EmbedFormatter.clone_error_embed(
+                "命令错误",
                 f"处理命令时发生错误: {str(error)}",
-                title="命令错误",
                 user_name=interaction.user.display_name
             )
-            
-            try:
-                if interaction.response.is_done():
-                    await interaction.followup.send(embed=embed, ephemeral=True)
-                else:
-                    await interaction.response.send_message(embed=embed, ephemeral=True)
-            except:
-                pass  # 如果无法发送错误消息就跳过
+            await self._send_interaction_error(interaction, embed)
+        
+        # 斜杠命令的错误由CommandTree.on_error处理，不会作为事件分发
+        self.bot.tree.on_error = on_app_command_error
         
         @self.bot.event
         async def on_error(event, *args, **kwargs):
             """全局错误处理"""
-            self.logger.error(f"未处理的错误在事件 {event}: {traceback.format_exc()}")
+            self.logger.exception(f"未处理的错误在事件 {event}")
+    
+    async def _send_interaction_error(self, interaction: discord.Interaction, embed: discord.Embed):
+        """向斜杠命令用户发送私密错误消息"""
+        try:
+            if interaction.response.is_done():
+                await interaction.followup.send(embed=embed, ephemeral=True)
+            else:
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+        except (discord.Forbidden, discord.HTTPException):
+            pass  # 如果无法发送错误消息就跳过
+    
+    def _queue_error_log(
+        self,
+        error_type: str,
+        error_message: str,
+        user_id: int = None,
+        channel_id: int = None,
+        traceback: str = None
+    ):
+        """将错误日志加入写入队列（堆栈信息按配置长度截断）"""
+        traceback = truncate_traceback(traceback, config.ERROR_TRACEBACK_MAX_CHARS)
+        self._error_logs.append((error_type, error_message, user_id, channel_id, traceback))
     
     async def setup_database(self):
         """设置数据库"""
@@ -194,14 +242,19 @@ class DiscordQABot:
             'admin_commands',  # 管理员命令（API监控等）
         ]
         
+        # 各Cog加载时互不依赖（跨Cog引用均在运行时通过get_cog获取），并发加载
+        results = await asyncio.gather(
+            *(self.bot.load_extension(f'cogs.{cog_name}') for cog_name in cogs_to_load),
+            return_exceptions=True
+        )
+        
         loaded_count = 0
-        for cog_name in cogs_to_load:
-            try:
-                await self.bot.load_extension(f'cogs.{cog_name}')
+        for cog_name, result in zip(cogs_to_load, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"加载Cog {cog_name} 失败: {result}")
+            else:
                 self.logger.info(f"已加载Cog: {cog_name}")
                 loaded_count += 1
-            except Exception as e:
-                self.logger.error(f"加载Cog {cog_name} 失败: {e}")
         
         self.logger.info(f"成功加载 {loaded_count}/{len(cogs_to_load)} 个Cog模块")
         
@@ -211,18 +264,38 @@ class DiscordQABot:
     async def start_bot(self):
         """启动机器人"""
         try:
-            # 初始化数据库
-            await self.setup_database()
+            # 数据库在后台初始化，与网关连接握手并行进行（数据库操作会等待初始化完成）
+            db_task = asyncio.create_task(self.setup_database())
+            self._error_logs.start()
             
             # 初始化API错误监控器
             await self.setup_error_monitor()
             
-            # 加载Cogs
-            await self.load_cogs()
+            # 加载Cogs，期间监视数据库初始化，初始化失败时立即中止启动
+            cogs_task = asyncio.create_task(self.load_cogs())
+            try:
+                done, _ = await asyncio.wait({db_task, cogs_task}, return_when=asyncio.FIRST_COMPLETED)
+                if db_task in done:
+                    db_task.result()  # 初始化失败时在此抛出
+                await cogs_task
+            except BaseException:
+                cogs_task.cancel()
+                db_task.cancel()
+                raise
             
             # 启动机器人
             self.logger.info("正在启动Discord机器人...")
-            await self.bot.start(config.DISCORD_TOKEN)
+            gateway_task = asyncio.create_task(self.bot.start(config.DISCORD_TOKEN))
+            
+            try:
+                await asyncio.gather(db_task, gateway_task)
+            except BaseException:
+                # 任一方失败（如数据库初始化失败）时取消另一方
+                db_task.cancel()
+                gateway_task.cancel()
+                if not self.bot.is_closed():
+                    await self.bot.close()
+                raise
             
         except Exception as e:
             self.logger.error(f"启动机器人失败: {e}")
@@ -237,6 +310,15 @@ class DiscordQABot:
             from utils.ai_client import ai_client
             await ai_client.close()
             
+            # 写入错误监控器中剩余的通知记录
+            from utils import api_error_monitor
+            if api_error_monitor.error_monitor:
+                await api_error_monitor.error_monitor.close()
+            
+            # 等待进行中的写入完成并写入剩余的错误日志后，关闭数据库连接池
+            await self._error_logs.close()
+            await database.close()
+            
             self.logger.info("资源清理完成")
         except Exception as e:
             self.logger.error(f"资源清理失败: {e}")
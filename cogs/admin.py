@@ -7,7 +7,7 @@ import asyncio
 import psutil
 import platform
 import time
-from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
 import discord
@@ -15,44 +15,76 @@ from discord.ext import commands, tasks
 from discord import app_commands
 
 from utils.logger import get_logger
+from utils.checks import admin_required
 from utils.message_formatter import EmbedFormatter, MessageType
 from utils.pagination_view import PaginationView
+from utils.command_sync import sync_command_tree
 from database import database
 from config import config
 
 logger = get_logger(__name__)
 
+# 平台信息在进程生命周期内不变，模块加载时获取一次（platform.processor()在部分系统上会调用外部命令）
+_PLATFORM_INFO = {
+    'platform': platform.system(),
+    'platform_release': platform.release(),
+    'architecture': platform.machine(),
+    'processor': platform.processor(),
+    'python_version': platform.python_version(),
+}
+
+_PLATFORM_SECTION = (
+    "[系统]\n"
+    f"操作系统: {_PLATFORM_INFO['platform']} {_PLATFORM_INFO['platform_release']}\n"
+    f"架构: {_PLATFORM_INFO['architecture']}\n"
+    f"Python: {_PLATFORM_INFO['python_version']}"
+)
+
 class AdminCog(commands.Cog, name="管理功能"):
     """管理功能模块"""
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.logger = get_logger(self.__class__.__name__)
-        self.start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
+        
+        # 系统资源快照（由采样任务定期刷新，命令处理时直接读取）；
+        # 首次采样由resource_sampler启动后立即在工作线程中完成，不在事件循环上同步采样
+        self._sys_snapshot: Optional[dict] = None
+        
+        # 预热CPU使用率计数（非阻塞，仅读取一次CPU时间）：psutil首次调用的返回值无意义（0.0），
+        # 预热后首次采样即为自Cog加载以来的平均使用率
+        psutil.cpu_percent(interval=None)
         
         # 启动定期任务
         self.cleanup_task.start()
         self.system_monitor.start()
+        self.resource_sampler.start()
     
     async def cog_unload(self):
         """Cog卸载时停止任务"""
-        self.cleanup_task.cancel()
-        self.system_monitor.cancel()
+        loops = (self.cleanup_task, self.system_monitor, self.resource_sampler)
+        for loop in loops:
+            loop.cancel()
+        
+        # 等待任务真正结束，避免重载时新旧实例的任务同时运行
+        running = [loop.get_task() for loop in loops if loop.get_task() is not None]
+        await asyncio.gather(*running, return_exceptions=True)
     
     def cog_check(self, ctx):
         """检查命令权限"""
         return config.is_admin_user(ctx.author.id)
     
     @app_commands.command(name="status", description="显示机器人状态信息")
+    @admin_required()
     async def status(self, interaction: discord.Interaction):
         """显示机器人状态"""
-        if not config.is_admin_user(interaction.user.id):
-            await interaction.response.send_message("❌ 您没有权限使用此命令", ephemeral=True)
-            return
+        # 先延迟响应，数据库冷启动时查询可能超过3秒的响应时限
+        await interaction.response.defer(ephemeral=True)
         
         # 获取系统信息
-        uptime = datetime.now() - self.start_time
-        uptime_str = self._format_uptime(uptime)
+        elapsed = int(time.monotonic() - self._start_monotonic)
+        uptime_str = self._format_uptime(elapsed)
         
         # 获取AI模块统计
         ai_cog = self.bot.get_cog("AI集成")
@@ -70,8 +102,9 @@ class AdminCog(commands.Cog, name="管理功能"):
         )
         
         # 添加系统信息
-        memory = psutil.virtual_memory()
-        cpu_percent = psutil.cpu_percent(interval=1)
+        snapshot = await self._get_snapshot()
+        memory = snapshot['memory']
+        cpu_percent = snapshot['cpu_percent']
         
         embed.add_field(
             name="💻 系统资源",
@@ -89,6 +122,16 @@ class AdminCog(commands.Cog, name="管理功能"):
             inline=True
         )
         
+        # 数据库连接池状态
+        pool_stats = database.pool.get_stats()
+        embed.add_field(
+            name="🗄️ 数据库连接池",
+            value=f"使用中: {pool_stats['in_use']}\n"
+                  f"空闲: {pool_stats['idle']}\n"
+                  f"上限: {pool_stats['max_size']}",
+            inline=True
+        )
+        
         # 添加配置信息
         embed.add_field(
             name="⚙️ 配置状态",
@@ -98,15 +141,15 @@ class AdminCog(commands.Cog, name="管理功能"):
             inline=True
         )
         
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.followup.send(embed=embed, ephemeral=True)
     
     @app_commands.command(name="reload_cog", description="重新加载指定的Cog模块")
+    @admin_required()
     @app_commands.describe(cog_name="要重新加载的Cog名称")
     async def reload_cog(self, interaction: discord.Interaction, cog_name: str):
         """重新加载Cog模块"""
-        if not config.is_admin_user(interaction.user.id):
-            await interaction.response.send_message("❌ 您没有权限使用此命令", ephemeral=True)
-            return
+        # 重新加载可能耗时较长，先延迟响应
+        await interaction.response.defer(ephemeral=True)
         
         try:
             await self.bot.reload_extension(f"cogs.{cog_name}")
@@ -130,16 +173,35 @@ class AdminCog(commands.Cog, name="管理功能"):
             )
             self.logger.error(f"重新加载Cog {cog_name} 失败: {e}")
         
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.followup.send(embed=embed, ephemeral=True)
+    
+    @commands.command(name="sync", hidden=True)
+    async def sync_commands(self, ctx):
+        """强制同步斜杠命令（管理员命令）"""
+        try:
+            synced = await sync_command_tree(self.bot, force=True, guild_id=config.DEV_GUILD_ID)
+            
+            embed = EmbedFormatter.create_success_embed(
+                f"✅ 已同步 {synced} 个斜杠命令",
+                user_name=ctx.author.display_name
+            )
+            
+            self.logger.info(f"管理员 {ctx.author.display_name} 同步了斜杠命令")
+            
+        except Exception as e:
+            embed = EmbedFormatter.create_error_embed(
+                f"❌ 同步斜杠命令失败: {str(e)}",
+                user_name=ctx.author.display_name
+            )
+            self.logger.error(f"同步斜杠命令失败: {e}")
+        
+        await ctx.send(embed=embed)
     
     @app_commands.command(name="cleanup_db", description="清理旧的数据库记录")
+    @admin_required()
     @app_commands.describe(days="保留多少天的记录（默认30天）")
     async def cleanup_database(self, interaction: discord.Interaction, days: int = 30):
         """清理数据库"""
-        if not config.is_admin_user(interaction.user.id):
-            await interaction.response.send_message("❌ 您没有权限使用此命令", ephemeral=True)
-            return
-        
         await interaction.response.defer(ephemeral=True)
         
         try:
@@ -162,12 +224,12 @@ class AdminCog(commands.Cog, name="管理功能"):
         await interaction.followup.send(embed=embed, ephemeral=True)
     
     @app_commands.command(name="user_stats", description="查看用户的使用统计")
+    @admin_required()
     @app_commands.describe(user="要查看的用户")
     async def user_stats(self, interaction: discord.Interaction, user: discord.User):
         """查看用户统计"""
-        if not config.is_admin_user(interaction.user.id):
-            await interaction.response.send_message("❌ 您没有权限使用此命令", ephemeral=True)
-            return
+        # 先延迟响应，数据库冷启动时查询可能超过3秒的响应时限
+        await interaction.response.defer(ephemeral=True)
         
         stats = await database.get_user_stats(user.id)
         
@@ -190,27 +252,27 @@ class AdminCog(commands.Cog, name="管理功能"):
                 inline=True
             )
             
+            # 时间戳交由Discord客户端按用户本地时区渲染
             if stats['first_question_at']:
-                first_time = datetime.fromisoformat(stats['first_question_at'])
                 embed.add_field(
                     name="首次提问", 
-                    value=first_time.strftime("%Y-%m-%d %H:%M"), 
+                    value=f"<t:{stats['first_question_at']}:f>", 
                     inline=True
                 )
             
             if stats['last_question_at']:
-                last_time = datetime.fromisoformat(stats['last_question_at'])
                 embed.add_field(
                     name="最近提问", 
-                    value=last_time.strftime("%Y-%m-%d %H:%M"), 
+                    value=f"<t:{stats['last_question_at']}:R>", 
                     inline=True
                 )
             
             embed.set_thumbnail(url=user.display_avatar.url)
         
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.followup.send(embed=embed, ephemeral=True)
     
     @app_commands.command(name="recent_questions", description="查看最近的问题记录")
+    @admin_required()
     @app_commands.describe(
         limit="显示数量（默认10）",
         hours="时间范围小时数（默认24小时）"
@@ -222,10 +284,6 @@ class AdminCog(commands.Cog, name="管理功能"):
         hours: int = 24
     ):
         """查看最近的问题"""
-        if not config.is_admin_user(interaction.user.id):
-            await interaction.response.send_message("❌ 您没有权限使用此命令", ephemeral=True)
-            return
-        
         await interaction.response.defer(ephemeral=True)
         
         questions = await database.get_recent_questions(limit, hours)
@@ -243,26 +301,25 @@ class AdminCog(commands.Cog, name="管理功能"):
             
             for i in range(0, len(questions), items_per_page):
                 page_questions = questions[i:i+items_per_page]
-                page_content = ""
+                entries = []
                 
                 for q in page_questions:
                     question_preview = q['question'][:150] + ("..." if len(q['question']) > 150 else "")
                     
-                    created_time = datetime.fromisoformat(q['created_at'])
-                    time_str = created_time.strftime("%m-%d %H:%M")
-                    
-                    page_content += f"**{q['user_name']}** ({time_str})\n"
-                    page_content += f"❓ {question_preview}\n"
+                    lines = [
+                        f"**{q['user_name']}** (<t:{q['created_at']}:f>)",
+                        f"❓ {question_preview}"
+                    ]
                     
                     if q['has_image']:
-                        page_content += "🖼️ 包含图片分析\n"
+                        lines.append("🖼️ 包含图片分析")
                     
                     if q['response_time']:
-                        page_content += f"⏱️ 响应时间: {q['response_time']:.2f}s\n"
+                        lines.append(f"⏱️ 响应时间: {q['response_time']:.2f}s")
                     
-                    page_content += "\n"
+                    entries.append("\n".join(lines))
                 
-                pages.append(page_content.strip())
+                pages.append("\n\n".join(entries).strip())
             
             # 如果只有一页内容，直接显示
             if len(pages) == 1:
@@ -293,61 +350,39 @@ class AdminCog(commands.Cog, name="管理功能"):
                 )
     
     @app_commands.command(name="system_info", description="显示系统详细信息")
+    @admin_required()
     async def system_info(self, interaction: discord.Interaction):
         """显示系统信息"""
-        if not config.is_admin_user(interaction.user.id):
-            await interaction.response.send_message("❌ 您没有权限使用此命令", ephemeral=True)
-            return
+        snapshot = await self._get_snapshot()
+        memory = snapshot['memory']
+        disk = snapshot['disk']
         
-        # 获取系统信息
-        system_info = {
-            'platform': platform.system(),
-            'platform_release': platform.release(),
-            'architecture': platform.machine(),
-            'processor': platform.processor(),
-            'python_version': platform.python_version(),
-        }
-        
-        # 获取内存信息
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        
-        embed = discord.Embed(
-            title="💻 系统详细信息",
-            color=EmbedFormatter.COLORS[MessageType.INFO]
-        )
-        
-        embed.add_field(
-            name="🖥️ 系统",
-            value=f"操作系统: {system_info['platform']} {system_info['platform_release']}\n"
-                  f"架构: {system_info['architecture']}\n"
-                  f"Python: {system_info['python_version']}",
-            inline=True
+        # 各部分合并为一个代码块放在描述中，而不是逐个添加字段
+        memory_section = (
+            "[内存]\n"
+            f"总计: {memory.total / 1024**3:.1f}GB\n"
+            f"使用: {memory.used / 1024**3:.1f}GB ({memory.percent:.1f}%)\n"
+            f"可用: {memory.available / 1024**3:.1f}GB"
         )
-        
-        embed.add_field(
-            name="💾 内存",
-            value=f"总计: {memory.total / 1024**3:.1f}GB\n"
-                  f"使用: {memory.used / 1024**3:.1f}GB ({memory.percent:.1f}%)\n"
-                  f"可用: {memory.available / 1024**3:.1f}GB",
-            inline=True
+        disk_section = (
+            "[磁盘]\n"
+            f"总计: {disk.total / 1024**3:.1f}GB\n"
+            f"使用: {disk.used / 1024**3:.1f}GB ({disk.percent:.1f}%)\n"
+            f"可用: {disk.free / 1024**3:.1f}GB"
         )
-        
-        embed.add_field(
-            name="💿 磁盘",
-            value=f"总计: {disk.total / 1024**3:.1f}GB\n"
-                  f"使用: {disk.used / 1024**3:.1f}GB ({disk.percent:.1f}%)\n"
-                  f"可用: {disk.free / 1024**3:.1f}GB",
-            inline=True
+        discord_section = (
+            "[Discord]\n"
+            f"延迟: {self.bot.latency * 1000:.1f}ms\n"
+            f"服务器数: {snapshot['guild_count']}\n"
+            f"用户数: {snapshot['user_count']}"
         )
         
-        # Discord.py信息
-        embed.add_field(
-            name="🤖 Discord信息",
-            value=f"延迟: {self.bot.latency * 1000:.1f}ms\n"
-                  f"服务器数: {len(self.bot.guilds)}\n"
-                  f"用户数: {len(self.bot.users)}",
-            inline=True
+        embed = discord.Embed(
+            title="💻 系统详细信息",
+            description=EmbedFormatter.format_code_block(
+                "\n\n".join((_PLATFORM_SECTION, memory_section, disk_section, discord_section))
+            ),
+            color=EmbedFormatter.COLORS[MessageType.INFO]
         )
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -365,8 +400,9 @@ class AdminCog(commands.Cog, name="管理功能"):
     async def system_monitor(self):
         """系统监控任务"""
         try:
-            memory = psutil.virtual_memory()
-            cpu_percent = psutil.cpu_percent(interval=1)
+            snapshot = await self._get_snapshot()
+            memory = snapshot['memory']
+            cpu_percent = snapshot['cpu_percent']
             
             # 如果资源使用过高，记录警告
             if memory.percent > 90 or cpu_percent > 90:
@@ -379,6 +415,16 @@ class AdminCog(commands.Cog, name="管理功能"):
         except Exception as e:
             self.logger.error(f"系统监控任务失败: {e}")
     
+    @tasks.loop(seconds=10)
+    async def resource_sampler(self):
+        """资源采样任务（刷新系统资源快照）"""
+        try:
+            # psutil调用涉及系统调用和文件系统访问，放到工作线程中执行以免阻塞事件循环
+            system = await asyncio.to_thread(_sample_system)
+            self._sys_snapshot = self._sample_resources(system)
+        except Exception as e:
+            self.logger.error(f"资源采样任务失败: {e}")
+    
     @cleanup_task.before_loop
     async def before_cleanup(self):
         """等待机器人就绪"""
@@ -389,18 +435,45 @@ class AdminCog(commands.Cog, name="管理功能"):
         """等待机器人就绪"""
         await self.bot.wait_until_ready()
     
-    def _format_uptime(self, uptime: timedelta) -> str:
+    async def _get_snapshot(self) -> dict:
+        """获取系统资源快照（首次采样尚未完成时立即在工作线程中采样）"""
+        if self._sys_snapshot is None:
+            system = await asyncio.to_thread(_sample_system)
+            self._sys_snapshot = self._sample_resources(system)
+        return self._sys_snapshot
+    
+    def _sample_resources(self, system: dict) -> dict:
+        """组合系统资源和连接状态快照"""
+        snapshot = dict(system)
+        snapshot['guild_count'] = len(self.bot.guilds)
+        # 使用网关提供的成员数，避免复制整个用户缓存
+        snapshot['user_count'] = sum(guild.member_count or 0 for guild in self.bot.guilds)
+        return snapshot
+    
+    def _format_uptime(self, elapsed_seconds: int) -> str:
         """格式化运行时间"""
-        days = uptime.days
-        hours, remainder = divmod(uptime.seconds, 3600)
-        minutes, _ = divmod(remainder, 60)
-        
-        if days > 0:
-            return f"{days}天 {hours}小时 {minutes}分钟"
-        elif hours > 0:
-            return f"{hours}小时 {minutes}分钟"
-        else:
-            return f"{minutes}分钟"
+        return _format_uptime_minutes(elapsed_seconds // 60)
+
+def _sample_system() -> dict:
+    """采集系统资源（CPU使用率为距上次采样的平均值，不阻塞；可在工作线程中调用）"""
+    return {
+        'cpu_percent': psutil.cpu_percent(interval=None),
+        'memory': psutil.virtual_memory(),
+        'disk': psutil.disk_usage('/'),
+    }
+
+@lru_cache(maxsize=1)
+def _format_uptime_minutes(total_minutes: int) -> str:
+    """按分钟格式化运行时间（精度为分钟，同一分钟内复用结果）"""
+    days, remainder = divmod(total_minutes, 1440)
+    hours, minutes = divmod(remainder, 60)
+    
+    if days > 0:
+        return f"{days}天 {hours}小时 {minutes}分钟"
+    elif hours > 0:
+        return f"{hours}小时 {minutes}分钟"
+    else:
+        return f"{minutes}分钟"
 
 async def setup(bot: commands.Bot):
     """设置Cog"""
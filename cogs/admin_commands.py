@@ -3,204 +3,234 @@
 提供API错误监控、系统状态和管理功能
 """
 
+import asyncio
+import time
+
 import discord
 from discord.ext import commands
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
 from utils.logger import get_logger
+from utils.checks import admin_required
 from utils.message_formatter import EmbedFormatter
 from utils.api_error_monitor import error_monitor
+from utils.ai_client import ai_client
 from database import database
 from config import config
 
 logger = get_logger(__name__)
 
+# 通知历史每页显示数量
+NOTIFICATION_PAGE_SIZE = 10
+
+# 严重程度图标
+_SEVERITY_ICONS = {'critical': '🚨', 'high': '⚠️', 'medium': '🟡', 'low': '🔵'}
+
+# 嵌入颜色
+_COLOR_ERROR_STATS = 0x3498DB           # 蓝色
+_COLOR_SYSTEM_STATUS = 0x2ECC71         # 绿色
+_COLOR_NOTIFICATION_HISTORY = 0x9B59B6  # 紫色
+_COLOR_FAILURE = 0xE74C3C               # 红色
+
+async def _empty_stats() -> Dict:
+    """错误监控器不可用时的空统计"""
+    return {}
+
 class AdminCommandsCog(commands.Cog, name="管理员命令"):
     """管理员命令功能模块"""
     
+    # 系统状态嵌入缓存有效期（秒）
+    SYSTEM_STATUS_CACHE_TTL = 15
+    
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.logger = get_logger(self.__class__.__name__)
+        
+        # 系统状态嵌入缓存 (生成时间, 嵌入)
+        self._system_status_cache: Optional[Tuple[float, discord.Embed]] = None
+        
+        # 频道总数（由事件增量维护，避免每次查询都遍历所有服务器）
+        self._channel_total = self._count_channels()
     
     async def cog_load(self):
         """Cog加载时的初始化"""
         self.logger.info("管理员命令模块已加载")
     
-    @discord.app_commands.command(name="api-errors", description="查看API错误统计（管理员）")
-    async def view_api_errors(self, interaction: discord.Interaction, hours: Optional[int] = 24):
-        """查看API错误统计"""
-        # 权限检查
-        if not config.is_admin_user(interaction.user.id):
-            embed = EmbedFormatter.create_error_embed(
-                "你没有权限使用此命令",
-                title="权限不足",
+    def _count_channels(self) -> int:
+        """完整统计所有服务器的频道数"""
+        return sum(len(guild.channels) for guild in self.bot.guilds)
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """连接就绪（含重连）时重新统计频道总数"""
+        self._channel_total = self._count_channels()
+    
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        """服务器数量变化时更新频道总数并使系统状态缓存失效"""
+        self._channel_total += len(guild.channels)
+        self._system_status_cache = None
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        """服务器数量变化时更新频道总数并使系统状态缓存失效"""
+        self._channel_total = max(0, self._channel_total - len(guild.channels))
+        self._system_status_cache = None
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        """新建频道时更新频道总数"""
+        self._channel_total += 1
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        """删除频道时更新频道总数"""
+        self._channel_total = max(0, self._channel_total - 1)
+    
+    async def cog_app_command_error(self, interaction: discord.Interaction, error: discord.app_commands.AppCommandError):
+        """本模块斜杠命令的统一错误处理"""
+        if isinstance(error, discord.app_commands.CheckFailure):
+            # 权限检查未通过，不记录错误日志
+            embed = EmbedFormatter.clone_error_embed(
+                "权限不足",
+                user_name=interaction.user.display_name
+            )
+        else:
+            original = getattr(error, 'original', error)
+            command_name = interaction.command.name if interaction.command else "未知"
+            self.logger.error(f"管理员命令 {command_name} 执行失败: {original}")
+            embed = EmbedFormatter.clone_error_embed(
+                "命令执行失败",
+                f"执行命令时发生问题: {str(original)}",
                 user_name=interaction.user.display_name
             )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            return
         
         try:
-            # 延迟响应，避免超时
-            await interaction.response.defer(ephemeral=True)
-            
-            # 获取数据库统计
-            db_stats = await database.get_api_error_statistics(hours=hours)
-            
-            # 获取内存统计（如果错误监控器可用）
+            if interaction.response.is_done():
+                await interaction.followup.send(embed=embed, ephemeral=True)
+            else:
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+        except (discord.Forbidden, discord.HTTPException):
+            pass  # 如果无法发送错误消息就跳过
+    
+    @discord.app_commands.command(name="api-errors", description="查看API错误统计（管理员）")
+    @admin_required()
+    async def view_api_errors(self, interaction: discord.Interaction, hours: Optional[int] = 24):
+        """查看API错误统计"""
+        # 延迟响应，避免超时
+        await interaction.response.defer(ephemeral=True)
+        
+        # 并发获取数据库统计和内存统计（如果错误监控器可用），单个来源失败时降级为空统计
+        db_stats, memory_stats = await asyncio.gather(
+            database.get_api_error_statistics(hours=hours, type_limit=5, recent_limit=3),
+            error_monitor.get_error_statistics() if error_monitor else _empty_stats(),
+            return_exceptions=True
+        )
+        if isinstance(db_stats, Exception):
+            self.logger.error(f"获取数据库错误统计失败: {db_stats}")
+            db_stats = {}
+        if isinstance(memory_stats, Exception):
+            self.logger.error(f"获取内存错误统计失败: {memory_stats}")
             memory_stats = {}
-            if error_monitor:
-                memory_stats = await error_monitor.get_error_statistics()
-            
-            # 创建统计报告嵌入
-            embed = await self._create_error_statistics_embed(db_stats, memory_stats, hours)
-            
-            await interaction.followup.send(embed=embed, ephemeral=True)
-            
-        except Exception as e:
-            self.logger.error(f"查看API错误统计失败: {e}")
-            error_embed = EmbedFormatter.create_error_embed(
-                f"获取错误统计时发生问题: {str(e)}",
-                title="统计获取失败",
-                user_name=interaction.user.display_name
-            )
-            await interaction.followup.send(embed=error_embed, ephemeral=True)
+        
+        # 创建统计报告嵌入
+        embed = await self._create_error_statistics_embed(db_stats, memory_stats, hours)
+        
+        await interaction.followup.send(embed=embed, ephemeral=True)
     
     @discord.app_commands.command(name="system-status", description="查看系统状态（管理员）")
+    @admin_required()
     async def view_system_status(self, interaction: discord.Interaction):
         """查看系统状态"""
-        # 权限检查
-        if not config.is_admin_user(interaction.user.id):
-            embed = EmbedFormatter.create_error_embed(
-                "你没有权限使用此命令",
-                title="权限不足",
-                user_name=interaction.user.display_name
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            return
+        # 延迟响应
+        await interaction.response.defer(ephemeral=True)
         
-        try:
-            # 延迟响应
-            await interaction.response.defer(ephemeral=True)
-            
+        # 短时间内重复查询直接使用缓存
+        cached = self._system_status_cache
+        if cached and time.monotonic() - cached[0] < self.SYSTEM_STATUS_CACHE_TTL:
+            embed = cached[1].copy()
+        else:
             # 收集系统信息
             system_info = await self._collect_system_information()
             
             # 创建系统状态嵌入
             embed = await self._create_system_status_embed(system_info)
-            
-            await interaction.followup.send(embed=embed, ephemeral=True)
-            
-        except Exception as e:
-            self.logger.error(f"查看系统状态失败: {e}")
-            error_embed = EmbedFormatter.create_error_embed(
-                f"获取系统状态时发生问题: {str(e)}",
-                title="状态获取失败",
-                user_name=interaction.user.display_name
-            )
-            await interaction.followup.send(embed=error_embed, ephemeral=True)
+            self._system_status_cache = (time.monotonic(), embed.copy())
+        
+        await interaction.followup.send(embed=embed, ephemeral=True)
     
     @discord.app_commands.command(name="notification-history", description="查看管理员通知历史（管理员）")
-    async def view_notification_history(self, interaction: discord.Interaction, limit: Optional[int] = 20):
+    @admin_required()
+    @discord.app_commands.describe(limit=f"每页显示数量（最多{NOTIFICATION_PAGE_SIZE}条）")
+    async def view_notification_history(self, interaction: discord.Interaction, limit: Optional[int] = NOTIFICATION_PAGE_SIZE):
         """查看管理员通知历史"""
-        # 权限检查
-        if not config.is_admin_user(interaction.user.id):
-            embed = EmbedFormatter.create_error_embed(
-                "你没有权限使用此命令",
-                title="权限不足",
+        # 延迟响应
+        await interaction.response.defer(ephemeral=True)
+        
+        # 获取第一页通知历史
+        page_size = max(1, min(limit or NOTIFICATION_PAGE_SIZE, NOTIFICATION_PAGE_SIZE))
+        notifications, has_older = await self._fetch_notification_page(page_size)
+        
+        if not notifications:
+            embed = EmbedFormatter.create_info_embed(
+                "暂无管理员通知记录",
+                title="通知历史",
                 user_name=interaction.user.display_name
             )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             return
         
-        try:
-            # 延迟响应
-            await interaction.response.defer(ephemeral=True)
-            
-            # 获取通知历史
-            notifications = await database.get_admin_notification_history(limit=limit)
-            
-            if not notifications:
-                embed = EmbedFormatter.create_info_embed(
-                    "暂无管理员通知记录",
-                    title="通知历史",
-                    user_name=interaction.user.display_name
-                )
-                await interaction.followup.send(embed=embed, ephemeral=True)
-                return
-            
-            # 创建通知历史嵌入
-            embed = await self._create_notification_history_embed(notifications)
-            
+        # 创建通知历史嵌入，有更早记录时附带翻页按钮
+        embed = await self._create_notification_history_embed(notifications)
+        
+        if has_older:
+            view = NotificationHistoryView(self, notifications, page_size, has_older=True)
+            await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+        else:
             await interaction.followup.send(embed=embed, ephemeral=True)
-            
-        except Exception as e:
-            self.logger.error(f"查看通知历史失败: {e}")
-            error_embed = EmbedFormatter.create_error_embed(
-                f"获取通知历史时发生问题: {str(e)}",
-                title="历史获取失败",
-                user_name=interaction.user.display_name
-            )
-            await interaction.followup.send(embed=error_embed, ephemeral=True)
     
     @discord.app_commands.command(name="test-notification", description="测试管理员通知功能（管理员）")
+    @admin_required()
     async def test_admin_notification(self, interaction: discord.Interaction):
         """测试管理员通知功能"""
-        # 权限检查
-        if not config.is_admin_user(interaction.user.id):
-            embed = EmbedFormatter.create_error_embed(
-                "你没有权限使用此命令",
-                title="权限不足",
-                user_name=interaction.user.display_name
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            return
+        # 立即响应
+        await interaction.response.send_message(
+            "🧪 正在测试管理员通知功能，请检查您的私信...", 
+            ephemeral=True
+        )
         
-        try:
-            # 立即响应
-            await interaction.response.send_message(
-                "🧪 正在测试管理员通知功能，请检查您的私信...", 
-                ephemeral=True
+        # 创建测试通知
+        if error_monitor:
+            await error_monitor._send_admin_notification(
+                error_key="test_notification",
+                severity="low",
+                error_record={
+                    'timestamp': datetime.now(),
+                    'error_type': 'test',
+                    'error_message': '这是一个测试通知，用于验证管理员通知系统是否正常工作。',
+                    'endpoint': 'test_endpoint',
+                    'user_id': interaction.user.id,
+                    'additional_info': {
+                        'test_by': interaction.user.display_name,
+                        'channel': interaction.channel.name if hasattr(interaction.channel, 'name') else 'DM'
+                    }
+                },
+                count=1
             )
             
-            # 创建测试通知
-            if error_monitor:
-                await error_monitor._send_admin_notification(
-                    error_key="test_notification",
-                    severity="low",
-                    error_record={
-                        'timestamp': datetime.now(),
-                        'error_type': 'test',
-                        'error_message': '这是一个测试通知，用于验证管理员通知系统是否正常工作。',
-                        'endpoint': 'test_endpoint',
-                        'user_id': interaction.user.id,
-                        'additional_info': {
-                            'test_by': interaction.user.display_name,
-                            'channel': interaction.channel.name if hasattr(interaction.channel, 'name') else 'DM'
-                        }
-                    },
-                    count=1
-                )
-                
-                # 记录测试
-                await database.log_admin_notification(
-                    notification_type="test",
-                    content="管理员通知功能测试",
-                    title="测试通知",
-                    severity="low",
-                    recipients_count=len(config.ADMIN_USERS),
-                    successful_sends=len(config.ADMIN_USERS)
-                )
-            else:
-                await interaction.followup.send(
-                    "❌ 错误监控器未初始化，无法测试通知功能", 
-                    ephemeral=True
-                )
-            
-        except Exception as e:
-            self.logger.error(f"测试管理员通知失败: {e}")
+            # 记录测试
+            error_monitor.queue_admin_notification(
+                notification_type="test",
+                content="管理员通知功能测试",
+                title="测试通知",
+                severity="low",
+                recipients_count=len(config.ADMIN_USERS),
+                successful_sends=len(config.ADMIN_USERS)
+            )
+        else:
             await interaction.followup.send(
-                f"❌ 测试通知失败: {str(e)}", 
+                "❌ 错误监控器未初始化，无法测试通知功能", 
                 ephemeral=True
             )
     
@@ -209,8 +239,8 @@ class AdminCommandsCog(commands.Cog, name="管理员命令"):
         embed = discord.Embed(
             title="📊 API错误统计报告",
             description=f"最近 **{hours} 小时** 的API错误统计信息",
-            color=0x3498DB,
-            timestamp=datetime.now()
+            color=_COLOR_ERROR_STATS,
+            timestamp=discord.utils.utcnow()
         )
         
         # 数据库统计
@@ -222,10 +252,12 @@ class AdminCommandsCog(commands.Cog, name="管理员命令"):
             )
             
             # 按类型统计
-            if db_stats.get('by_type'):
-                type_text = ""
-                for item in db_stats['by_type'][:5]:  # 只显示前5个
-                    type_text += f"• {item['type']}: {item['records']}条 ({item['total_count']}次)\n"
+            by_type = db_stats.get('by_type')
+            if by_type:
+                type_text = "\n".join(
+                    f"• {item['type']}: {item['records']}条 ({item['total_count']}次)"
+                    for item in by_type
+                )
                 
                 if type_text:
                     embed.add_field(
@@ -235,13 +267,13 @@ class AdminCommandsCog(commands.Cog, name="管理员命令"):
                     )
             
             # 按严重程度统计
-            if db_stats.get('by_severity'):
-                severity_text = ""
-                severity_icons = {'critical': '🚨', 'high': '⚠️', 'medium': '🟡', 'low': '🔵'}
-                
-                for item in db_stats['by_severity']:
-                    icon = severity_icons.get(item['severity'], '🔵')
-                    severity_text += f"{icon} {item['severity'].upper()}: {item['records']}条\n"
+            by_severity = db_stats.get('by_severity')
+            if by_severity:
+                severity_parts = []
+                for item in by_severity:
+                    icon = _SEVERITY_ICONS.get(item['severity'], '🔵')
+                    severity_parts.append(f"{icon} {item['severity'].upper()}: {item['records']}条")
+                severity_text = "\n".join(severity_parts)
                 
                 if severity_text:
                     embed.add_field(
@@ -251,10 +283,12 @@ class AdminCommandsCog(commands.Cog, name="管理员命令"):
                     )
             
             # 最近的错误
-            if db_stats.get('recent_errors'):
-                recent_text = ""
-                for error in db_stats['recent_errors'][:3]:  # 只显示最近3个
-                    recent_text += f"• **{error['type']}**: {error['message'][:50]}...\n"
+            recent_errors = db_stats.get('recent_errors')
+            if recent_errors:
+                recent_text = "\n".join(
+                    f"• **{error['type']}**: {error['message'][:50]}..."
+                    for error in recent_errors
+                )
                 
                 if recent_text:
                     embed.add_field(
@@ -265,10 +299,11 @@ class AdminCommandsCog(commands.Cog, name="管理员命令"):
         
         # 内存统计（如果可用）
         if memory_stats:
-            if memory_stats.get('last_hour', {}).get('count', 0) > 0:
+            last_hour_count = memory_stats.get('last_hour', {}).get('count', 0)
+            if last_hour_count > 0:
                 embed.add_field(
                     name="⚡ 实时统计",
-                    value=f"最近1小时: **{memory_stats['last_hour']['count']}** 个错误",
+                    value=f"最近1小时: **{last_hour_count}** 个错误",
                     inline=True
                 )
         
@@ -276,65 +311,81 @@ class AdminCommandsCog(commands.Cog, name="管理员命令"):
         return embed
     
     async def _collect_system_information(self) -> Dict:
-        """收集系统信息"""
+        """收集系统信息（各子系统并发探测，单个探测失败不影响其他部分）"""
+        probes = {
+            'ai_status': self._probe_ai(),
+            'bot_status': self._probe_bot(),
+            'config_status': self._probe_config(),
+            'monitor_status': self._probe_monitor()
+        }
+        results = await asyncio.gather(*probes.values(), return_exceptions=True)
+        
         info = {}
+        errors = []
+        for key, result in zip(probes, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"收集系统信息时出错 ({key}): {result}")
+                errors.append(f"{key}: {result}")
+            else:
+                info[key] = result
         
-        try:
-            # AI客户端状态
-            from utils.ai_client import ai_client
-            info['ai_status'] = ai_client.get_available_apis()
-            
-            # 机器人状态
-            info['bot_status'] = {
-                'latency': round(self.bot.latency * 1000, 2),
-                'guilds': len(self.bot.guilds),
-                'users': len(self.bot.users),
-                'channels': sum(len(guild.channels) for guild in self.bot.guilds)
-            }
-            
-            # 配置状态
-            info['config_status'] = {
-                'admin_users': len(config.ADMIN_USERS),
-                'monitor_channels': len(config.MONITOR_CHANNELS) if config.MONITOR_CHANNELS else "全部频道",
-                'auto_reply_enabled': config.AUTO_REPLY_ENABLED,
-                'keyword_trigger_enabled': config.KEYWORD_TRIGGER_ENABLED
-            }
-            
-            # 错误监控状态
-            info['monitor_status'] = {
-                'initialized': error_monitor is not None,
-                'recent_errors': len(error_monitor.recent_errors) if error_monitor else 0,
-                'error_types': len(error_monitor.error_counts) if error_monitor else 0
-            }
-            
-        except Exception as e:
-            self.logger.error(f"收集系统信息时出错: {e}")
-            info['error'] = str(e)
+        if errors:
+            info['error'] = "\n".join(errors)
         
         return info
     
+    async def _probe_ai(self) -> Dict:
+        """AI客户端状态"""
+        return ai_client.get_available_apis()
+    
+    async def _probe_bot(self) -> Dict:
+        """机器人状态"""
+        # bot.guilds每次访问都会复制一份列表，只取一次并在同一次遍历中统计
+        guild_count = 0
+        user_count = 0
+        for guild in self.bot.guilds:
+            guild_count += 1
+            user_count += guild.member_count or 0
+        
+        return {
+            'latency': round(self.bot.latency * 1000, 2),
+            'guilds': guild_count,
+            'users': user_count,
+            'channels': self._channel_total
+        }
+    
+    async def _probe_config(self) -> Dict:
+        """配置状态"""
+        return {
+            'admin_users': len(config.ADMIN_USERS),
+            'monitor_channels': len(config.MONITOR_CHANNELS) if config.MONITOR_CHANNELS else "全部频道",
+            'auto_reply_enabled': config.AUTO_REPLY_ENABLED,
+            'keyword_trigger_enabled': config.KEYWORD_TRIGGER_ENABLED
+        }
+    
+    async def _probe_monitor(self) -> Dict:
+        """错误监控状态"""
+        if not error_monitor:
+            return {'initialized': False, 'recent_errors': 0, 'error_types': 0}
+        
+        return {'initialized': True, **error_monitor.stats_snapshot()}
+    
     async def _create_system_status_embed(self, system_info: Dict) -> discord.Embed:
         """创建系统状态嵌入消息"""
         embed = discord.Embed(
             title="🖥️ 系统状态报告",
             description="QA Bot 当前系统状态概览",
-            color=0x2ECC71,
-            timestamp=datetime.now()
+            color=_COLOR_SYSTEM_STATUS,
+            timestamp=discord.utils.utcnow()
         )
         
         # AI客户端状态
         if 'ai_status' in system_info:
             ai_status = system_info['ai_status']
-            ai_text = ""
-            if ai_status.get('custom_api'):
-                ai_text += "✅ 自定义API: 可用\n"
-            else:
-                ai_text += "❌ 自定义API: 不可用\n"
-                
-            if ai_status.get('gemini'):
-                ai_text += "✅ Gemini: 可用\n"
-            else:
-                ai_text += "❌ Gemini: 不可用\n"
+            ai_text = "\n".join((
+                "✅ 自定义API: 可用" if ai_status.get('custom_api') else "❌ 自定义API: 不可用",
+                "✅ Gemini: 可用" if ai_status.get('gemini') else "❌ Gemini: 不可用"
+            ))
             
             embed.add_field(
                 name="🤖 AI服务状态",
@@ -345,10 +396,12 @@ class AdminCommandsCog(commands.Cog, name="管理员命令"):
         # 机器人状态
         if 'bot_status' in system_info:
             bot_status = system_info['bot_status']
-            bot_text = f"延迟: **{bot_status['latency']}ms**\n"
-            bot_text += f"服务器: **{bot_status['guilds']}**\n"
-            bot_text += f"用户: **{bot_status['users']}**\n"
-            bot_text += f"频道: **{bot_status['channels']}**"
+            bot_text = "\n".join((
+                f"延迟: **{bot_status['latency']}ms**",
+                f"服务器: **{bot_status['guilds']}**",
+                f"用户: **{bot_status['users']}**",
+                f"频道: **{bot_status['channels']}**"
+            ))
             
             embed.add_field(
                 name="📡 连接状态",
@@ -359,10 +412,12 @@ class AdminCommandsCog(commands.Cog, name="管理员命令"):
         # 功能配置状态
         if 'config_status' in system_info:
             config_status = system_info['config_status']
-            config_text = f"管理员: **{config_status['admin_users']}** 人\n"
-            config_text += f"监控频道: **{config_status['monitor_channels']}**\n"
-            config_text += f"自动回复: **{'启用' if config_status['auto_reply_enabled'] else '禁用'}**\n"
-            config_text += f"关键词触发: **{'启用' if config_status['keyword_trigger_enabled'] else '禁用'}**"
+            config_text = "\n".join((
+                f"管理员: **{config_status['admin_users']}** 人",
+                f"监控频道: **{config_status['monitor_channels']}**",
+                f"自动回复: **{'启用' if config_status['auto_reply_enabled'] else '禁用'}**",
+                f"关键词触发: **{'启用' if config_status['keyword_trigger_enabled'] else '禁用'}**"
+            ))
             
             embed.add_field(
                 name="⚙️ 功能配置",
@@ -373,9 +428,11 @@ class AdminCommandsCog(commands.Cog, name="管理员命令"):
         # 错误监控状态
         if 'monitor_status' in system_info:
             monitor_status = system_info['monitor_status']
-            monitor_text = f"监控器: **{'已启用' if monitor_status['initialized'] else '未启用'}**\n"
-            monitor_text += f"最近错误: **{monitor_status['recent_errors']}** 条\n"
-            monitor_text += f"错误类型: **{monitor_status['error_types']}** 种"
+            monitor_text = "\n".join((
+                f"监控器: **{'已启用' if monitor_status['initialized'] else '未启用'}**",
+                f"最近错误: **{monitor_status['recent_errors']}** 条",
+                f"错误类型: **{monitor_status['error_types']}** 种"
+            ))
             
             embed.add_field(
                 name="🔍 错误监控",
@@ -390,52 +447,127 @@ class AdminCommandsCog(commands.Cog, name="管理员命令"):
                 value=f"```\n{system_info['error']}\n```",
                 inline=False
             )
-            embed.color = 0xE74C3C
+            embed.color = _COLOR_FAILURE
         
         embed.set_footer(text="QA Bot 系统监控")
         return embed
     
-    async def _create_notification_history_embed(self, notifications: List[Dict]) -> discord.Embed:
-        """创建通知历史嵌入消息"""
-        embed = discord.Embed(
-            title="📜 管理员通知历史",
-            description=f"最近 **{len(notifications)}** 条通知记录",
-            color=0x9B59B6,
-            timestamp=datetime.now()
+    async def _fetch_notification_page(
+        self,
+        page_size: int,
+        before_id: Optional[int] = None,
+        after_id: Optional[int] = None
+    ) -> Tuple[List[Dict], bool]:
+        """
+        获取一页通知历史
+        
+        Returns:
+            (通知列表, 翻页方向上是否还有更多记录)
+        """
+        # 多取一条用于判断是否还有更多记录
+        notifications = await database.get_admin_notification_history(
+            limit=page_size + 1,
+            before_id=before_id,
+            after_id=after_id
         )
+        has_more = len(notifications) > page_size
+        if has_more:
+            # 向新翻页时多出的是最新一条（列表开头），否则是最早一条（列表末尾）
+            notifications = notifications[1:] if after_id is not None else notifications[:page_size]
+        return notifications, has_more
+    
+    async def _create_notification_history_embed(self, notifications: List[Dict]) -> discord.Embed:
+        """创建通知历史嵌入消息（所有记录合并到描述中，不逐条添加字段）"""
+        lines = [f"本页 **{len(notifications)}** 条通知记录"]
         
-        for i, notif in enumerate(notifications[:10]):  # 最多显示10条
+        for notif in notifications:
             # 严重程度图标
-            severity_icons = {
-                'critical': '🚨',
-                'high': '⚠️', 
-                'medium': '🟡',
-                'low': '🔵'
-            }
-            icon = severity_icons.get(notif['severity'], '🔵')
+            icon = _SEVERITY_ICONS.get(notif['severity'], '🔵')
             
             # 发送状态
-            if notif['successful_sends'] > 0:
-                status = f"✅ {notif['successful_sends']}/{notif['recipients_count']}"
+            successful_sends = notif['successful_sends']
+            if successful_sends > 0:
+                status = f"✅ {successful_sends}/{notif['recipients_count']}"
             else:
                 status = "❌ 发送失败"
             
-            embed.add_field(
-                name=f"{icon} {notif['type'].upper()} - {notif['created_at'][:16]}",
-                value=f"{notif['content'][:100]}{'...' if len(notif['content']) > 100 else ''}\n{status}",
-                inline=False
+            # 内容预览（SQL中已截取，被截断时追加省略号）
+            preview = notif['content'] + '…' if notif['content_truncated'] else notif['content']
+            
+            lines.append(
+                f"{icon} **{notif['type'].upper()}** `{notif['created_at'][:16]}` {status}\n{preview}"
             )
         
-        if len(notifications) > 10:
-            embed.add_field(
-                name="📊 更多记录",
-                value=f"还有 **{len(notifications) - 10}** 条记录未显示",
-                inline=False
-            )
+        embed = discord.Embed(
+            title="📜 管理员通知历史",
+            description="\n\n".join(lines),
+            color=_COLOR_NOTIFICATION_HISTORY,
+            timestamp=discord.utils.utcnow()
+        )
         
         embed.set_footer(text="QA Bot 通知系统")
         return embed
 
+class NotificationHistoryView(discord.ui.View):
+    """管理员通知历史的游标分页视图（每次翻页只查询一页记录）"""
+    
+    def __init__(
+        self,
+        cog: AdminCommandsCog,
+        notifications: List[Dict],
+        page_size: int,
+        has_older: bool,
+        has_newer: bool = False,
+        timeout: float = 300.0
+    ):
+        super().__init__(timeout=timeout)
+        self.cog = cog
+        self.page_size = page_size
+        self._set_page(notifications, has_older, has_newer)
+    
+    def _set_page(self, notifications: List[Dict], has_older: bool, has_newer: bool):
+        """更新当前页和按钮状态"""
+        self.notifications = notifications
+        self.older_page.disabled = not has_older
+        self.newer_page.disabled = not has_newer
+    
+    @discord.ui.button(label='⬅️ 更早', style=discord.ButtonStyle.gray)
+    async def older_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """查看更早的通知"""
+        # 先确认交互再查询数据库，避免查询较慢时超过3秒的响应时限
+        await interaction.response.defer()
+        notifications, has_older = await self.cog._fetch_notification_page(
+            self.page_size,
+            before_id=self.notifications[-1]['id']
+        )
+        await self._show(interaction, notifications, has_older=has_older, has_newer=True)
+    
+    @discord.ui.button(label='更新 ➡️', style=discord.ButtonStyle.gray)
+    async def newer_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """查看更新的通知"""
+        # 先确认交互再查询数据库，避免查询较慢时超过3秒的响应时限
+        await interaction.response.defer()
+        notifications, has_newer = await self.cog._fetch_notification_page(
+            self.page_size,
+            after_id=self.notifications[0]['id']
+        )
+        await self._show(interaction, notifications, has_older=True, has_newer=has_newer)
+    
+    async def _show(self, interaction: discord.Interaction, notifications: List[Dict], has_older: bool, has_newer: bool):
+        """显示新的一页（交互已延迟响应，查询为空时保持当前页）"""
+        if not notifications:
+            return
+        
+        self._set_page(notifications, has_older, has_newer)
+        embed = await self.cog._create_notification_history_embed(notifications)
+        await interaction.edit_original_response(embed=embed, view=self)
+    
+    async def on_timeout(self):
+        """超时处理"""
+        # 禁用所有按钮
+        for item in self.children:
+            item.disabled = True
+
 async def setup(bot: commands.Bot):
     """设置Cog"""
     await bot.add_cog(AdminCommandsCog(bot))
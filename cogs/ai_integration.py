@@ -4,10 +4,10 @@ AI集成Cog
 """
 
 import asyncio
+import tempfile
 import time
 import traceback
-from typing import Optional, Union
-from io import BytesIO
+from typing import BinaryIO, Optional, Union
 
 import discord
 from discord.ext import commands
@@ -18,12 +18,47 @@ from utils.logger import get_logger
 from utils.ai_client import ai_client
 from utils.message_formatter import EmbedFormatter, MessageType
 from utils.pagination_view import PaginationView
+from utils.write_queue import WriteBehindQueue
 from database import database
 from config import config
 from config import config
 
 logger = get_logger(__name__)
 
+# 下载图片时保留在内存中的最大字节数，超过后溢出到临时文件
+IMAGE_SPOOL_MAX_MEMORY = 2 * 1024 * 1024
+
+# 允许分析的最大图片像素数（防止解压炸弹占用大量内存）
+MAX_IMAGE_PIXELS = 50_000_000
+
+# AI接口可直接接受的图片格式，小于阈值时跳过PIL解码直接传递原始字节
+RAW_IMAGE_CONTENT_TYPES = ('image/jpeg', 'image/png')
+RAW_IMAGE_MAX_BYTES = 4 * 1024 * 1024
+
+def _decode_image(fp: BinaryIO) -> Image.Image:
+    """解码图片文件（CPU密集，应在线程中调用）"""
+    image = Image.open(fp)
+    # Image.open只读取文件头，在解码像素数据前检查尺寸
+    if image.width * image.height > MAX_IMAGE_PIXELS:
+        raise ValueError(f"图片尺寸过大: {image.width}x{image.height}")
+    image.load()
+    return image
+
+async def _download_attachment(attachment: discord.Attachment) -> BinaryIO:
+    """流式下载附件到临时文件（小文件保留在内存中，大文件溢出到磁盘），调用方负责关闭"""
+    spooled = tempfile.SpooledTemporaryFile(max_size=IMAGE_SPOOL_MAX_MEMORY)
+    try:
+        session = await ai_client.get_session()
+        async with session.get(attachment.url) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                spooled.write(chunk)
+        spooled.seek(0)
+        return spooled
+    except BaseException:
+        spooled.close()
+        raise
+
 class AIIntegrationCog(commands.Cog, name="AI集成"):
     """AI集成功能模块"""
     
@@ -33,15 +68,43 @@ class AIIntegrationCog(commands.Cog, name="AI集成"):
         self.request_count = 0
         self.total_response_time = 0.0
         
+        # 待写入数据库的问答记录（由后台任务批量写入，不阻塞回复流程）
+        self._qa_records = WriteBehindQueue("问答记录", database.record_qa_bulk, max_size=10000)
+        
     async def cog_load(self):
         """Cog加载时的初始化"""
+        self._qa_records.start()
         self.logger.info("AI集成模块已加载")
     
     async def cog_unload(self):
         """Cog卸载时的清理"""
+        # 等待进行中的写入完成，再写入剩余的问答记录
+        await self._qa_records.close()
+        
         await ai_client.close()
         self.logger.info("AI集成模块已卸载")
     
+    def _queue_qa_record(
+        self,
+        user: discord.User,
+        channel: discord.abc.Messageable,
+        question: str,
+        answer: str,
+        has_image: bool,
+        response_time: float
+    ):
+        """将问答记录加入写入队列"""
+        self._qa_records.append((
+            user.id,
+            user.display_name,
+            channel.id,
+            channel.guild.id if channel.guild else None,
+            question,
+            answer,
+            has_image,
+            response_time
+        ))
+    
     @app_commands.command(name="ask", description="向AI询问SillyTavern相关问题")
     @app_commands.describe(question="你想问的问题")
     async def ask_question(self, interaction: discord.Interaction, question: str):
@@ -76,7 +139,7 @@ class AIIntegrationCog(commands.Cog, name="AI集成"):
     @app_commands.command(name="help-st", description="显示SillyTavern帮助信息")
     async def help_sillytavern(self, interaction: discord.Interaction):
         """显示帮助信息"""
-        embed = EmbedFormatter.create_help_embed()
+        embed = EmbedFormatter.clone_help_embed()
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @app_commands.command(name="help-detail", description="显示详细帮助信息")
@@ -252,12 +315,10 @@ class AIIntegrationCog(commands.Cog, name="AI集成"):
                             delete_after=config.AUTO_DELETE_DELAY
                         )
             
-            # 记录到数据库
-            await database.record_qa(
-                user_id=user.id,
-                user_name=user.display_name,
-                channel_id=channel.id,
-                guild_id=channel.guild.id if channel.guild else None,
+            # 记录到数据库（加入写入队列，由后台任务批量写入）
+            self._queue_qa_record(
+                user,
+                channel,
                 question=question,
                 answer=ai_response,
                 has_image=False,
@@ -284,7 +345,7 @@ class AIIntegrationCog(commands.Cog, name="AI集成"):
                         embed=error_embed, 
                         delete_after=config.AUTO_DELETE_DELAY
                     )
-            except:
+            except (discord.Forbidden, discord.HTTPException):
                 pass  # 如果发送错误消息也失败了，就不再尝试
             
             # 记录错误到数据库
@@ -334,10 +395,14 @@ class AIIntegrationCog(commands.Cog, name="AI集成"):
                     await channel.send(embed=error_embed)
                 return
             
-            # 检查文件大小 (20MB限制)
-            if attachment.size > 20 * 1024 * 1024:
+            # 检查文件大小 (20MB限制) 和像素数（Discord提供尺寸时无需下载即可拒绝）
+            too_many_pixels = (
+                attachment.width and attachment.height and
+                attachment.width * attachment.height > MAX_IMAGE_PIXELS
+            )
+            if attachment.size > 20 * 1024 * 1024 or too_many_pixels:
                 error_embed = EmbedFormatter.create_error_embed(
-                    "图片文件过大，请上传小于20MB的图片。",
+                    "图片文件过大，请上传小于20MB且尺寸适中的图片。",
                     title="文件过大",
                     user_name=user.display_name
                 )
@@ -358,9 +423,17 @@ class AIIntegrationCog(commands.Cog, name="AI集成"):
                 )
                 await interaction.response.send_message(embed=thinking_embed, ephemeral=config.EPHEMERAL_REPLIES)
             
-            # 下载并处理图片
-            image_data = await attachment.read()
-            image = Image.open(BytesIO(image_data))
+            if (
+                attachment.content_type in RAW_IMAGE_CONTENT_TYPES and
+                attachment.size < RAW_IMAGE_MAX_BYTES and
+                attachment.width and attachment.height
+            ):
+                # 格式已被AI接口支持且尺寸已知，直接传递原始字节，省去解码再编码
+                image = await attachment.read()
+            else:
+                # 流式下载图片，解码放到线程中执行，避免大图占满内存或阻塞事件循环
+                with await _download_attachment(attachment) as image_file:
+                    image = await asyncio.to_thread(_decode_image, image_file)
             
             # 构建分析问题
             analysis_question = description if description else "请分析这张SillyTavern相关的截图，说明可能的问题和解决方案。"
@@ -485,12 +558,10 @@ class AIIntegrationCog(commands.Cog, name="AI集成"):
                             delete_after=config.AUTO_DELETE_DELAY
                         )
             
-            # 记录到数据库
-            await database.record_qa(
-                user_id=user.id,
-                user_name=user.display_name,
-                channel_id=channel.id,
-                guild_id=channel.guild.id if channel.guild else None,
+            # 记录到数据库（加入写入队列，由后台任务批量写入）
+            self._queue_qa_record(
+                user,
+                channel,
                 question=f"图像分析: {analysis_question}",
                 answer=ai_response,
                 has_image=True,
@@ -517,8 +588,8 @@ class AIIntegrationCog(commands.Cog, name="AI集成"):
                         embed=error_embed, 
                         delete_after=config.AUTO_DELETE_DELAY
                     )
-            except:
-                pass
+            except (discord.Forbidden, discord.HTTPException):
+                pass  # 如果发送错误消息也失败了，就不再尝试
             
             # 记录错误到数据库
             await database.log_error(
@@ -539,7 +610,8 @@ class AIIntegrationCog(commands.Cog, name="AI集成"):
         return {
             'request_count': self.request_count,
             'avg_response_time': avg_response_time,
-            'total_response_time': self.total_response_time
+            'total_response_time': self.total_response_time,
+            **ai_client.get_cache_stats()
         }
 
 async def setup(bot: commands.Bot):
@@ -247,13 +247,14 @@ class KnowledgeBaseCog(commands.Cog, name="知识库"):
             embed.add_field(name="快速修复", value=quick_fixes_count, inline=True)
             embed.add_field(name="资源链接", value=resources_count, inline=True)
             
-            # 添加最近更新时间
-            if self.knowledge_file.exists():
-                import os
-                mtime = os.path.getmtime(self.knowledge_file)
-                from datetime import datetime
-                update_time = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
-                embed.add_field(name="最后更新", value=update_time, inline=True)
+            # 添加最近更新时间（单次stat同时完成存在性检查和读取修改时间）
+            try:
+                mtime = self.knowledge_file.stat().st_mtime
+            except FileNotFoundError:
+                mtime = None
+            if mtime is not None:
+                # 时间戳交由Discord客户端按用户本地时区渲染
+                embed.add_field(name="最后更新", value=f"<t:{int(mtime)}:f>", inline=True)
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
             
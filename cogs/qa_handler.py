@@ -58,8 +58,11 @@ class QAHandlerCog(commands.Cog, name="问答处理"):
         # 合并的关键词模式
         self.keyword_patterns = self.default_keyword_patterns.copy()
         
-        # 编译正则表达式以提高性能
-        self.compiled_patterns = []
+        # 编译正则表达式以提高性能（先使用默认关键词，动态关键词加载后重新编译）
+        self.compiled_patterns = [
+            re.compile(pattern, re.IGNORECASE | re.UNICODE)
+            for pattern in self.keyword_patterns
+        ]
         
         # 加载动态关键词（异步任务）
         asyncio.create_task(self._load_dynamic_keywords())
@@ -78,10 +81,9 @@ class QAHandlerCog(commands.Cog, name="问答处理"):
     
     async def cog_load(self):
         """Cog加载时的初始化"""
-        # 确保动态关键词已加载
-        await self._load_dynamic_keywords()
+        # 动态关键词由__init__中创建的任务在数据库就绪后加载，这里不等待，避免Cog加载阻塞网关连接
         self.logger.info("问答处理模块已加载")
-        self.logger.info(f"监听关键词模式: {len(self.keyword_patterns)} 个 (默认: {len(self.default_keyword_patterns)}, 动态: {len(self.dynamic_keyword_patterns)})")
+        self.logger.info(f"默认关键词模式: {len(self.default_keyword_patterns)} 个，动态关键词后台加载中")
     
     async def _load_dynamic_keywords(self):
         """从数据库加载动态关键词"""
@@ -267,13 +269,13 @@ class QAHandlerCog(commands.Cog, name="问答处理"):
                 placeholder_msg = await message.reply(embed=placeholder_embed)
                 self.logger.info(f"✅ 已发送图片分析占位消息，消息ID: {placeholder_msg.id}")
                 
-                # 记录关键词触发事件（图片类型）
-                await database.record_keyword_trigger(
+                # 记录关键词触发事件（图片类型），后台写入，不阻塞AI回复
+                asyncio.create_task(database.record_keyword_trigger(
                     user_id=message.author.id,
                     channel_id=message.channel.id,
                     keyword=f"{triggered_keyword} (with image)",
                     message_content=message.content[:500]  # 限制长度
-                )
+                ))
                 
                 # 获取AI集成Cog来处理图片分析
                 ai_cog = self.bot.get_cog("AI集成")
@@ -314,13 +316,13 @@ class QAHandlerCog(commands.Cog, name="问答处理"):
                 placeholder_msg = await message.reply(embed=placeholder_embed)
                 self.logger.info(f"✅ 已发送占位消息，消息ID: {placeholder_msg.id}")
                 
-                # 记录关键词触发事件
-                await database.record_keyword_trigger(
+                # 记录关键词触发事件，后台写入，不阻塞AI回复
+                asyncio.create_task(database.record_keyword_trigger(
                     user_id=message.author.id,
                     channel_id=message.channel.id,
                     keyword=triggered_keyword,
                     message_content=message.content[:500]  # 限制长度
-                )
+                ))
                 
                 # 获取AI集成Cog来处理问题
                 ai_cog = self.bot.get_cog("AI集成")
@@ -489,6 +491,15 @@ class QAHandlerCog(commands.Cog, name="问答处理"):
     
     # ==================== 动态关键词管理命令 ====================
     
+    async def _send_permission_denied(self, interaction: discord.Interaction, requirement: str):
+        """发送权限不足提示（基于缓存的错误嵌入模板）"""
+        embed = EmbedFormatter.clone_error_embed(
+            "权限不足",
+            requirement,
+            user_name=interaction.user.display_name
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
     @discord.app_commands.command(name="keyword-add", description="添加新的正则关键词（管理员）")
     @commands.has_permissions(administrator=True) 
     @discord.app_commands.describe(
@@ -499,12 +510,7 @@ class QAHandlerCog(commands.Cog, name="问答处理"):
         """添加新的正则关键词"""
         # 检查权限
         if not interaction.user.guild_permissions.manage_messages:
-            embed = EmbedFormatter.create_error_embed(
-                "权限不足",
-                "需要管理消息权限才能使用此命令。",
-                user_name=interaction.user.display_name
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await self._send_permission_denied(interaction, "需要管理消息权限才能使用此命令。")
             return
         
         # 验证正则表达式
@@ -548,12 +554,7 @@ class QAHandlerCog(commands.Cog, name="问答处理"):
         """删除正则关键词"""
         # 检查权限
         if not interaction.user.guild_permissions.manage_messages:
-            embed = EmbedFormatter.create_error_embed(
-                "权限不足",
-                "需要管理消息权限才能使用此命令。",
-                user_name=interaction.user.display_name
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await self._send_permission_denied(interaction, "需要管理消息权限才能使用此命令。")
             return
         
         # 从数据库删除
@@ -585,12 +586,7 @@ class QAHandlerCog(commands.Cog, name="问答处理"):
         """切换关键词启用状态"""
         # 检查权限
         if not interaction.user.guild_permissions.manage_messages:
-            embed = EmbedFormatter.create_error_embed(
-                "权限不足",
-                "需要管理消息权限才能使用此命令。",
-                user_name=interaction.user.display_name
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await self._send_permission_denied(interaction, "需要管理消息权限才能使用此命令。")
             return
         
         # 切换状态
@@ -682,12 +678,7 @@ class QAHandlerCog(commands.Cog, name="问答处理"):
         """重新加载关键词"""
         # 检查管理员权限
         if not interaction.user.guild_permissions.administrator:
-            embed = EmbedFormatter.create_error_embed(
-                "权限不足",
-                "需要管理员权限才能使用此命令。",
-                user_name=interaction.user.display_name
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await self._send_permission_denied(interaction, "需要管理员权限才能使用此命令。")
             return
         
         try:
@@ -32,6 +32,11 @@ class Config:
         # 管理员配置
         admin_users_str = os.getenv('ADMIN_USERS', '')
         self.ADMIN_USERS = [int(uid.strip()) for uid in admin_users_str.split(',') if uid.strip().isdigit()]
+        self.ADMIN_USER_IDS = frozenset(self.ADMIN_USERS)  # 用于O(1)权限检查
+        
+        # 开发服务器配置 (可选，设置后斜杠命令只同步到该服务器，立即生效)
+        dev_guild_id_str = os.getenv('DEV_GUILD_ID', '').strip()
+        self.DEV_GUILD_ID: Optional[int] = int(dev_guild_id_str) if dev_guild_id_str.isdigit() else None
         
         # 频道配置
         monitor_channels_str = os.getenv('MONITOR_CHANNELS', '')
@@ -52,6 +57,9 @@ class Config:
         
         # 数据库配置
         self.DATABASE_PATH = os.getenv('DATABASE_PATH', 'qa_bot.db')
+        self.DATABASE_POOL_MIN_SIZE = int(os.getenv('DATABASE_POOL_MIN_SIZE', '1'))  # 连接池最小连接数
+        self.DATABASE_POOL_MAX_SIZE = int(os.getenv('DATABASE_POOL_MAX_SIZE', '5'))  # 连接池最大连接数
+        self.ERROR_TRACEBACK_MAX_CHARS = int(os.getenv('ERROR_TRACEBACK_MAX_CHARS', '8192'))  # 错误日志中堆栈信息的最大长度
         
         # SillyTavern相关关键词
         self.SILLYTAVERN_KEYWORDS = [
@@ -70,9 +78,13 @@ class Config:
         self.TEMPERATURE = 0.7
         self.REQUEST_TIMEOUT = 60
         
+        # 问答缓存（相同问题直接返回缓存回复，容量为0表示禁用）
+        self.AI_RESPONSE_CACHE_SIZE = int(os.getenv('AI_RESPONSE_CACHE_SIZE', '512'))
+        self.AI_RESPONSE_CACHE_TTL = int(os.getenv('AI_RESPONSE_CACHE_TTL', '3600'))  # 缓存有效期（秒）
+        
     def is_admin_user(self, user_id: int) -> bool:
         """检查用户是否为管理员"""
-        return user_id in self.ADMIN_USERS
+        return user_id in self.ADMIN_USER_IDS
     
     def should_monitor_channel(self, channel_id: int) -> bool:
         """检查是否应该监听指定频道"""
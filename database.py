@@ -6,22 +6,184 @@
 import re
 import sqlite3
 import asyncio
+import time
 import aiosqlite
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Set, Tuple, AsyncIterator
 from pathlib import Path
 
-from utils.logger import get_logger
+from utils.logger import get_logger, truncate_traceback
 from config import config
 
 logger = get_logger(__name__)
 
+class ConnectionPool:
+    """aiosqlite连接池，复用已建立的连接，避免每次查询重复打开数据库"""
+    
+    # 关闭连接池时等待借出连接归还的最长时间（秒）
+    CLOSE_TIMEOUT = 5.0
+    
+    def __init__(self, db_path: str, min_size: int = 1, max_size: int = 5):
+        self.db_path = db_path
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size, 1)
+        
+        # 队列和信号量需要在事件循环内创建，因此延迟到open()中初始化
+        self._idle: Optional[asyncio.LifoQueue] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        
+        # 所有存活的连接（空闲+借出），关闭时据此确保每个连接都被关闭
+        self._connections: Set[aiosqlite.Connection] = set()
+        self._closing = False
+        self._drained: Optional[asyncio.Event] = None
+    
+    async def open(self):
+        """创建最小数量的连接（重复调用无副作用）"""
+        if self._idle is not None:
+            return
+        
+        self._idle = asyncio.LifoQueue()
+        self._semaphore = asyncio.Semaphore(self.max_size)
+        
+        for _ in range(self.min_size):
+            self._idle.put_nowait(await self._connect())
+        
+        logger.info(f"数据库连接池已就绪 (min={self.min_size}, max={self.max_size})")
+    
+    async def _connect(self) -> aiosqlite.Connection:
+        """新建一个连接"""
+        conn = await aiosqlite.connect(self.db_path)
+        self._connections.add(conn)
+        return conn
+    
+    async def _discard(self, conn: aiosqlite.Connection):
+        """关闭并丢弃一个连接"""
+        self._connections.discard(conn)
+        try:
+            await conn.close()
+        except Exception as e:
+            logger.error(f"关闭数据库连接失败: {e}")
+    
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        """从连接池借出一个连接，使用完毕后自动归还"""
+        await self.open()
+        
+        async with self._semaphore:
+            if self._closing:
+                raise RuntimeError("数据库连接池正在关闭")
+            
+            conn = self._idle.get_nowait() if not self._idle.empty() else await self._connect()
+            healthy = True
+            try:
+                yield conn
+            except BaseException:
+                # 回滚未提交的事务，保证归还的连接处于干净状态
+                try:
+                    await conn.rollback()
+                except Exception:
+                    healthy = False
+                raise
+            finally:
+                if conn not in self._connections:
+                    pass  # 关闭连接池时等待超时，已被强制关闭
+                elif healthy and not self._closing:
+                    self._idle.put_nowait(conn)
+                else:
+                    # 连接池正在关闭时，归还的连接直接关闭
+                    await self._discard(conn)
+                    if self._closing and not self._connections:
+                        self._drained.set()
+    
+    async def close(self):
+        """关闭连接池：关闭空闲连接，等待借出的连接归还后关闭（超时则强制关闭）"""
+        if self._idle is None or self._closing:
+            return
+        
+        self._closing = True
+        self._drained = asyncio.Event()
+        try:
+            while not self._idle.empty():
+                await self._discard(self._idle.get_nowait())
+            
+            if self._connections:
+                try:
+                    await asyncio.wait_for(self._drained.wait(), self.CLOSE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    logger.warning(f"仍有 {len(self._connections)} 个数据库连接未归还，强制关闭")
+                    for conn in list(self._connections):
+                        await self._discard(conn)
+        finally:
+            self._idle = None
+            self._semaphore = None
+            self._drained = None
+            self._closing = False
+    
+    def get_stats(self) -> Dict[str, int]:
+        """获取连接池状态"""
+        idle = self._idle.qsize() if self._idle is not None else 0
+        size = len(self._connections)
+        return {
+            'size': size,
+            'idle': idle,
+            'in_use': size - idle,
+            'max_size': self.max_size
+        }
+
 class Database:
     """异步数据库管理类"""
     
+    # API错误统计缓存有效期（秒）
+    API_ERROR_STATS_CACHE_TTL = 30
+    
     def __init__(self, db_path: str = None):
         self.db_path = db_path or config.DATABASE_PATH
         self._ensure_db_directory()
+        self.pool = ConnectionPool(
+            self.db_path,
+            min_size=config.DATABASE_POOL_MIN_SIZE,
+            max_size=config.DATABASE_POOL_MAX_SIZE
+        )
+        
+        # 初始化完成事件（需要在事件循环内创建，延迟到首次使用时初始化）
+        self._ready_event: Optional[asyncio.Event] = None
+        # 初始化失败时的异常（等待初始化的操作会立即失败，而不是一直等待）
+        self._init_error: Optional[BaseException] = None
+        
+        # API错误统计缓存 {(hours, type_limit, recent_limit): (生成时间, 统计结果)}，记录新错误时清空
+        self._api_error_stats_cache: Dict[Tuple[int, int, int], Tuple[float, Dict]] = {}
+        
+        # 进行中的API错误统计查询，相同参数的并发请求共享同一次查询
+        self._api_error_stats_inflight: Dict[Tuple[int, int, int], asyncio.Task] = {}
+    
+    @property
+    def ready_event(self) -> asyncio.Event:
+        """数据库初始化完成事件"""
+        if self._ready_event is None:
+            self._ready_event = asyncio.Event()
+        return self._ready_event
+    
+    @property
+    def is_ready(self) -> bool:
+        """数据库是否已完成初始化"""
+        return (
+            self._ready_event is not None and self._ready_event.is_set()
+            and self._init_error is None
+        )
+    
+    async def wait_ready(self):
+        """等待数据库初始化完成（初始化失败时抛出RuntimeError）"""
+        await self.ready_event.wait()
+        if self._init_error is not None:
+            raise RuntimeError(f"数据库初始化失败: {self._init_error}") from self._init_error
+    
+    @asynccontextmanager
+    async def _pooled_connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """等待初始化完成后从连接池借出连接"""
+        await self.wait_ready()
+        async with self.pool.acquire() as db:
+            yield db
     
     def _ensure_db_directory(self):
         """确保数据库目录存在"""
@@ -30,6 +192,7 @@ class Database:
     
     async def initialize(self):
         """初始化数据库表结构"""
+        self._init_error = None
         try:
             async with aiosqlite.connect(self.db_path) as db:
                 # 问答记录表
@@ -165,117 +328,116 @@ class Database:
                 
                 await db.commit()
                 logger.info("数据库初始化完成")
+            
+            # 表结构就绪后预热连接池
+            await self.pool.open()
+            self.ready_event.set()
                 
         except Exception as e:
             logger.error(f"数据库初始化失败: {e}")
+            # 唤醒所有等待初始化的操作，使其立即失败
+            self._init_error = e
+            self.ready_event.set()
             raise
     
-    async def record_qa(
-        self,
-        user_id: int,
-        user_name: str,
-        channel_id: int,
-        guild_id: Optional[int],
-        question: str,
-        answer: str,
-        has_image: bool = False,
-        response_time: float = None
-    ) -> int:
+    async def close(self):
+        """关闭数据库连接池"""
+        await self.pool.close()
+    
+    async def record_qa_bulk(self, rows: List[Tuple]) -> int:
         """
-        记录问答会话
+        批量记录问答会话（单个事务内写入记录并更新用户统计）
         
+        Args:
+            rows: (user_id, user_name, channel_id, guild_id, question, answer, has_image, response_time) 元组列表
+            
         Returns:
-            新记录的ID
+            写入的记录数
         """
+        if not rows:
+            return 0
+        
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute("""
+            async with self._pooled_connection() as db:
+                await db.executemany("""
                     INSERT INTO qa_records (
                         user_id, user_name, channel_id, guild_id, 
                         question, answer, has_image, response_time
                     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    user_id, user_name, channel_id, guild_id,
-                    question, answer, has_image, response_time
-                ))
+                """, rows)
                 
-                record_id = cursor.lastrowid
-                await db.commit()
+                # 按顺序更新用户统计（同一用户的多条记录依次累加）
+                for user_id, user_name, _, _, _, _, has_image, response_time in rows:
+                    await self._apply_user_stats(db, user_id, user_name, has_image, response_time)
                 
-                # 更新用户统计
-                await self._update_user_stats(user_id, user_name, has_image, response_time)
-                
-                logger.info(f"问答记录已保存，ID: {record_id}")
-                return record_id
+                await db.commit()
+                logger.debug(f"批量保存了 {len(rows)} 条问答记录")
+                return len(rows)
                 
         except Exception as e:
-            logger.error(f"保存问答记录失败: {e}")
-            raise
+            logger.error(f"批量保存问答记录失败: {e}")
+            return 0
     
-    async def _update_user_stats(
+    async def _apply_user_stats(
         self,
+        db: aiosqlite.Connection,
         user_id: int,
         user_name: str,
         has_image: bool = False,
         response_time: float = None
     ):
-        """更新用户统计信息"""
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # 检查用户是否存在
-                cursor = await db.execute(
-                    "SELECT total_questions, total_images, avg_response_time FROM user_stats WHERE user_id = ?",
-                    (user_id,)
-                )
-                result = await cursor.fetchone()
-                
-                now = datetime.now()
-                
-                if result:
-                    # 更新现有记录
-                    total_questions, total_images, avg_response_time = result
-                    new_total_questions = total_questions + 1
-                    new_total_images = total_images + (1 if has_image else 0)
-                    
-                    # 计算新的平均响应时间
-                    if response_time and avg_response_time:
-                        new_avg_response_time = (avg_response_time * total_questions + response_time) / new_total_questions
-                    else:
-                        new_avg_response_time = response_time or avg_response_time
-                    
-                    await db.execute("""
-                        UPDATE user_stats SET
-                            user_name = ?, total_questions = ?, total_images = ?,
-                            avg_response_time = ?, last_question_at = ?, updated_at = ?
-                        WHERE user_id = ?
-                    """, (
-                        user_name, new_total_questions, new_total_images,
-                        new_avg_response_time, now, now, user_id
-                    ))
-                else:
-                    # 插入新记录
-                    await db.execute("""
-                        INSERT INTO user_stats (
-                            user_id, user_name, total_questions, total_images,
-                            avg_response_time, first_question_at, last_question_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        user_id, user_name, 1, 1 if has_image else 0,
-                        response_time or 0, now, now
-                    ))
-                
-                await db.commit()
-                
-        except Exception as e:
-            logger.error(f"更新用户统计失败: {e}")
+        """在给定连接上更新用户统计信息（不提交事务）"""
+        # 检查用户是否存在
+        cursor = await db.execute(
+            "SELECT total_questions, total_images, avg_response_time FROM user_stats WHERE user_id = ?",
+            (user_id,)
+        )
+        result = await cursor.fetchone()
+        
+        now = datetime.now()
+        
+        if result:
+            # 更新现有记录
+            total_questions, total_images, avg_response_time = result
+            new_total_questions = total_questions + 1
+            new_total_images = total_images + (1 if has_image else 0)
+            
+            # 计算新的平均响应时间
+            if response_time and avg_response_time:
+                new_avg_response_time = (avg_response_time * total_questions + response_time) / new_total_questions
+            else:
+                new_avg_response_time = response_time or avg_response_time
+            
+            await db.execute("""
+                UPDATE user_stats SET
+                    user_name = ?, total_questions = ?, total_images = ?,
+                    avg_response_time = ?, last_question_at = ?, updated_at = ?
+                WHERE user_id = ?
+            """, (
+                user_name, new_total_questions, new_total_images,
+                new_avg_response_time, now, now, user_id
+            ))
+        else:
+            # 插入新记录
+            await db.execute("""
+                INSERT INTO user_stats (
+                    user_id, user_name, total_questions, total_images,
+                    avg_response_time, first_question_at, last_question_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                user_id, user_name, 1, 1 if has_image else 0,
+                response_time or 0, now, now
+            ))
     
     async def get_user_stats(self, user_id: int) -> Optional[Dict[str, Any]]:
-        """获取用户统计信息"""
+        """获取用户统计信息（首次/最近提问时间为Unix时间戳）"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._pooled_connection() as db:
+                # first/last_question_at以本地时间写入，转换时需指定'utc'修饰符
                 cursor = await db.execute("""
                     SELECT user_name, total_questions, total_images, avg_response_time,
-                           first_question_at, last_question_at
+                           CAST(strftime('%s', first_question_at, 'utc') AS INTEGER),
+                           CAST(strftime('%s', last_question_at, 'utc') AS INTEGER)
                     FROM user_stats WHERE user_id = ?
                 """, (user_id,))
                 
@@ -300,18 +462,18 @@ class Database:
         limit: int = 10,
         hours: int = 24
     ) -> List[Dict[str, Any]]:
-        """获取最近的问题记录"""
+        """获取最近的问题记录（created_at为Unix时间戳）"""
         try:
-            since = datetime.now() - timedelta(hours=hours)
-            
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._pooled_connection() as db:
+                # created_at由CURRENT_TIMESTAMP写入（UTC），时间范围同样按UTC计算
                 cursor = await db.execute("""
-                    SELECT user_name, question, answer, has_image, response_time, created_at
+                    SELECT user_name, question, answer, has_image, response_time,
+                           CAST(strftime('%s', created_at) AS INTEGER)
                     FROM qa_records 
-                    WHERE created_at >= ?
+                    WHERE created_at >= datetime('now', ?)
                     ORDER BY created_at DESC 
                     LIMIT ?
-                """, (since, limit))
+                """, (f'-{int(hours)} hours', limit))
                 
                 results = await cursor.fetchall()
                 return [
@@ -331,41 +493,27 @@ class Database:
             return []
     
     async def get_system_stats(self) -> Dict[str, Any]:
-        """获取系统统计信息"""
+        """获取系统统计信息（单次查询完成所有聚合）"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # 总问题数
-                cursor = await db.execute("SELECT COUNT(*) FROM qa_records")
-                total_questions = (await cursor.fetchone())[0]
-                
-                # 今日问题数
-                today = datetime.now().date()
-                cursor = await db.execute(
-                    "SELECT COUNT(*) FROM qa_records WHERE DATE(created_at) = ?",
-                    (today,)
-                )
-                today_questions = (await cursor.fetchone())[0]
-                
-                # 活跃用户数
-                cursor = await db.execute("SELECT COUNT(*) FROM user_stats")
-                total_users = (await cursor.fetchone())[0]
-                
-                # 平均响应时间
-                cursor = await db.execute(
-                    "SELECT AVG(response_time) FROM qa_records WHERE response_time IS NOT NULL"
-                )
-                avg_response_time = (await cursor.fetchone())[0] or 0
-                
-                # 图像分析数量
-                cursor = await db.execute("SELECT COUNT(*) FROM qa_records WHERE has_image = TRUE")
-                total_images = (await cursor.fetchone())[0]
+            today = datetime.now().date()
+            
+            async with self._pooled_connection() as db:
+                cursor = await db.execute("""
+                    SELECT
+                        (SELECT COUNT(*) FROM qa_records),
+                        (SELECT COUNT(*) FROM qa_records WHERE DATE(created_at) = ?),
+                        (SELECT COUNT(*) FROM user_stats),
+                        (SELECT AVG(response_time) FROM qa_records WHERE response_time IS NOT NULL),
+                        (SELECT COUNT(*) FROM qa_records WHERE has_image = TRUE)
+                """, (today,))
+                row = await cursor.fetchone()
                 
                 return {
-                    'total_questions': total_questions,
-                    'today_questions': today_questions,
-                    'total_users': total_users,
-                    'avg_response_time': avg_response_time,
-                    'total_images': total_images
+                    'total_questions': row[0],
+                    'today_questions': row[1],
+                    'total_users': row[2],
+                    'avg_response_time': row[3] or 0,
+                    'total_images': row[4]
                 }
                 
         except Exception as e:
@@ -381,7 +529,7 @@ class Database:
     ):
         """记录关键词触发事件"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._pooled_connection() as db:
                 await db.execute("""
                     INSERT INTO keyword_triggers (user_id, channel_id, keyword, message_content)
                     VALUES (?, ?, ?, ?)
@@ -401,8 +549,9 @@ class Database:
         traceback: str = None
     ):
         """记录错误日志"""
+        traceback = truncate_traceback(traceback, config.ERROR_TRACEBACK_MAX_CHARS)
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._pooled_connection() as db:
                 await db.execute("""
                     INSERT INTO error_logs (error_type, error_message, user_id, channel_id, traceback)
                     VALUES (?, ?, ?, ?, ?)
@@ -413,12 +562,39 @@ class Database:
         except Exception as e:
             logger.error(f"记录错误日志失败: {e}")
     
+    async def log_errors_bulk(self, rows: List[Tuple]) -> int:
+        """
+        批量记录错误日志
+        
+        Args:
+            rows: (error_type, error_message, user_id, channel_id, traceback) 元组列表
+            
+        Returns:
+            写入的记录数
+        """
+        if not rows:
+            return 0
+        
+        try:
+            async with self._pooled_connection() as db:
+                await db.executemany("""
+                    INSERT INTO error_logs (error_type, error_message, user_id, channel_id, traceback)
+                    VALUES (?, ?, ?, ?, ?)
+                """, rows)
+                
+                await db.commit()
+                return len(rows)
+                
+        except Exception as e:
+            logger.error(f"批量记录错误日志失败: {e}")
+            return 0
+    
     async def cleanup_old_records(self, days: int = 30):
         """清理旧记录"""
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._pooled_connection() as db:
                 # 清理旧的问答记录
                 cursor = await db.execute(
                     "DELETE FROM qa_records WHERE created_at < ?",
@@ -458,14 +634,15 @@ class Database:
             # 验证正则表达式
             re.compile(pattern, re.IGNORECASE | re.UNICODE)
             
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute(
+            async with self._pooled_connection() as db:
+                # 连接会被复用，不能用累计的total_changes判断本次是否插入成功
+                cursor = await db.execute(
                     """INSERT OR IGNORE INTO regex_keywords 
                        (pattern, description, created_by) VALUES (?, ?, ?)""",
                     (pattern, description, created_by)
                 )
                 await db.commit()
-                return db.total_changes > 0
+                return cursor.rowcount > 0
                 
         except re.error as e:
             logger.error(f"无效的正则表达式 '{pattern}': {e}")
@@ -477,7 +654,7 @@ class Database:
     async def remove_regex_keyword(self, pattern: str) -> bool:
         """删除正则关键词"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._pooled_connection() as db:
                 cursor = await db.execute(
                     "DELETE FROM regex_keywords WHERE pattern = ?",
                     (pattern,)
@@ -492,7 +669,7 @@ class Database:
     async def toggle_regex_keyword(self, pattern: str) -> Optional[bool]:
         """切换正则关键词的启用状态"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._pooled_connection() as db:
                 # 获取当前状态
                 cursor = await db.execute(
                     "SELECT enabled FROM regex_keywords WHERE pattern = ?",
@@ -543,7 +720,7 @@ class Database:
         try:
             import json
             
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._pooled_connection() as db:
                 # 检查是否已有相同的错误记录
                 cursor = await db.execute("""
                     SELECT id, count FROM api_errors 
@@ -576,44 +753,81 @@ class Database:
                     record_id = cursor.lastrowid
                 
                 await db.commit()
+                self._api_error_stats_cache.clear()
+                self._api_error_stats_inflight.clear()
                 return record_id
                 
         except Exception as e:
             logger.error(f"记录API错误失败: {e}")
             return 0
     
-    async def get_api_error_statistics(self, hours: int = 24) -> Dict:
+    async def get_api_error_statistics(
+        self,
+        hours: int = 24,
+        type_limit: int = 5,
+        recent_limit: int = 3
+    ) -> Dict:
         """
         获取API错误统计信息
         
         Args:
             hours: 统计最近多少小时的错误
+            type_limit: 按类型统计返回的类型数量（按记录数从多到少）
+            recent_limit: 返回的最近错误数量
             
         Returns:
             统计信息字典
         """
+        cache_key = (hours, type_limit, recent_limit)
+        cached = self._api_error_stats_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self.API_ERROR_STATS_CACHE_TTL:
+            return cached[1]
+        
+        # 缓存未命中时，相同参数的并发请求合并为一次查询
+        task = self._api_error_stats_inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._query_api_error_statistics(cache_key, hours, type_limit, recent_limit)
+            )
+            self._api_error_stats_inflight[cache_key] = task
+            task.add_done_callback(
+                lambda done: self._discard_api_error_stats_query(cache_key, done)
+            )
+        
+        # 单个调用方被取消时不影响其他等待同一查询的调用方
+        return await asyncio.shield(task)
+    
+    def _discard_api_error_stats_query(self, cache_key: Tuple[int, int, int], task: asyncio.Task):
+        """查询结束后移除进行中记录（期间已被新的查询替换时保留新记录）"""
+        if self._api_error_stats_inflight.get(cache_key) is task:
+            del self._api_error_stats_inflight[cache_key]
+    
+    async def _query_api_error_statistics(
+        self,
+        cache_key: Tuple[int, int, int],
+        hours: int,
+        type_limit: int,
+        recent_limit: int
+    ) -> Dict:
+        """执行API错误统计查询并写入缓存"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # 总错误数
-                cursor = await db.execute("""
-                    SELECT COUNT(*) FROM api_errors 
-                    WHERE last_occurred >= datetime('now', '-{} hours')
-                """.format(hours))
-                total_errors = (await cursor.fetchone())[0]
-                
-                # 按类型统计
+            since = f'-{int(hours)} hours'
+            
+            async with self._pooled_connection() as db:
+                # 按类型统计（只取记录最多的前几种）
                 cursor = await db.execute("""
                     SELECT error_type, COUNT(*), SUM(count) FROM api_errors 
-                    WHERE last_occurred >= datetime('now', '-{} hours')
+                    WHERE last_occurred >= datetime('now', ?)
                     GROUP BY error_type 
                     ORDER BY COUNT(*) DESC
-                """.format(hours))
+                    LIMIT ?
+                """, (since, type_limit))
                 by_type = await cursor.fetchall()
                 
-                # 按严重程度统计
+                # 按严重程度统计（各严重程度记录数之和即为总错误数）
                 cursor = await db.execute("""
                     SELECT severity, COUNT(*), SUM(count) FROM api_errors 
-                    WHERE last_occurred >= datetime('now', '-{} hours')
+                    WHERE last_occurred >= datetime('now', ?)
                     GROUP BY severity 
                     ORDER BY 
                         CASE severity 
@@ -622,21 +836,22 @@ class Database:
                             WHEN 'medium' THEN 3 
                             WHEN 'low' THEN 4 
                         END
-                """.format(hours))
+                """, (since,))
                 by_severity = await cursor.fetchall()
+                total_errors = sum(row[1] for row in by_severity)
                 
-                # 最近的错误
+                # 最近的错误（消息在SQL中截取预览）
                 cursor = await db.execute("""
-                    SELECT error_type, error_message, severity, endpoint, 
-                           count, last_occurred 
+                    SELECT error_type, substr(error_message, 1, 100), length(error_message) > 100,
+                           severity, endpoint, count, last_occurred 
                     FROM api_errors 
-                    WHERE last_occurred >= datetime('now', '-{} hours')
+                    WHERE last_occurred >= datetime('now', ?)
                     ORDER BY last_occurred DESC 
-                    LIMIT 10
-                """.format(hours))
+                    LIMIT ?
+                """, (since, recent_limit))
                 recent_errors = await cursor.fetchall()
                 
-                return {
+                stats = {
                     'total_errors': total_errors,
                     'by_type': [
                         {'type': row[0], 'records': row[1], 'total_count': row[2]} 
@@ -649,14 +864,18 @@ class Database:
                     'recent_errors': [
                         {
                             'type': row[0],
-                            'message': row[1][:100] + ('...' if len(row[1]) > 100 else ''),
-                            'severity': row[2],
-                            'endpoint': row[3],
-                            'count': row[4],
-                            'last_occurred': row[5]
+                            'message': row[1] + ('...' if row[2] else ''),
+                            'severity': row[3],
+                            'endpoint': row[4],
+                            'count': row[5],
+                            'last_occurred': row[6]
                         } for row in recent_errors
                     ]
                 }
+                # 查询期间有新错误记录时（进行中记录已被清空），结果可能已过期，不写入缓存
+                if self._api_error_stats_inflight.get(cache_key) is asyncio.current_task():
+                    self._api_error_stats_cache[cache_key] = (time.monotonic(), stats)
+                return stats
                 
         except Exception as e:
             logger.error(f"获取API错误统计失败: {e}")
@@ -688,7 +907,7 @@ class Database:
             记录ID
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._pooled_connection() as db:
                 cursor = await db.execute("""
                     INSERT INTO admin_notifications (
                         notification_type, title, content, severity,
@@ -706,39 +925,106 @@ class Database:
             logger.error(f"记录管理员通知失败: {e}")
             return 0
     
-    async def get_admin_notification_history(self, limit: int = 50) -> List[Dict]:
+    async def log_admin_notifications_bulk(self, rows: List[Tuple]) -> int:
+        """
+        批量记录管理员通知
+        
+        Args:
+            rows: (notification_type, title, content, severity,
+                   recipients_count, successful_sends, failed_sends) 元组列表
+            
+        Returns:
+            写入的记录数
+        """
+        if not rows:
+            return 0
+        
+        try:
+            async with self._pooled_connection() as db:
+                await db.executemany("""
+                    INSERT INTO admin_notifications (
+                        notification_type, title, content, severity,
+                        recipients_count, successful_sends, failed_sends
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                
+                await db.commit()
+                return len(rows)
+                
+        except Exception as e:
+            logger.error(f"批量记录管理员通知失败: {e}")
+            return 0
+    
+    async def get_admin_notification_history(
+        self,
+        limit: int = 50,
+        before_id: Optional[int] = None,
+        after_id: Optional[int] = None,
+        preview_length: int = 100
+    ) -> List[Dict]:
         """
-        获取管理员通知历史
+        获取管理员通知历史（按ID游标分页，结果按时间从新到旧排列）
         
         Args:
             limit: 返回记录数量限制
+            before_id: 只返回ID小于该值的记录（更早的一页）
+            after_id: 只返回ID大于该值的记录（更新的一页）
+            preview_length: 通知内容预览长度（在SQL中截取，不读取完整内容）
             
         Returns:
             通知历史列表
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute("""
-                    SELECT notification_type, title, content, severity,
-                           recipients_count, successful_sends, failed_sends,
-                           created_at
-                    FROM admin_notifications 
-                    ORDER BY created_at DESC 
-                    LIMIT ?
-                """, (limit,))
-                
-                rows = await cursor.fetchall()
+            async with self._pooled_connection() as db:
+                if after_id is not None:
+                    # 向新翻页时按ID升序取紧邻的记录，再反转为从新到旧
+                    cursor = await db.execute("""
+                        SELECT id, notification_type, title,
+                               substr(content, 1, ?), length(content) > ?, severity,
+                               recipients_count, successful_sends, failed_sends,
+                               created_at
+                        FROM admin_notifications 
+                        WHERE id > ?
+                        ORDER BY id ASC 
+                        LIMIT ?
+                    """, (preview_length, preview_length, after_id, limit))
+                    rows = list(reversed(await cursor.fetchall()))
+                elif before_id is not None:
+                    cursor = await db.execute("""
+                        SELECT id, notification_type, title,
+                               substr(content, 1, ?), length(content) > ?, severity,
+                               recipients_count, successful_sends, failed_sends,
+                               created_at
+                        FROM admin_notifications 
+                        WHERE id < ?
+                        ORDER BY id DESC 
+                        LIMIT ?
+                    """, (preview_length, preview_length, before_id, limit))
+                    rows = await cursor.fetchall()
+                else:
+                    cursor = await db.execute("""
+                        SELECT id, notification_type, title,
+                               substr(content, 1, ?), length(content) > ?, severity,
+                               recipients_count, successful_sends, failed_sends,
+                               created_at
+                        FROM admin_notifications 
+                        ORDER BY id DESC 
+                        LIMIT ?
+                    """, (preview_length, preview_length, limit))
+                    rows = await cursor.fetchall()
                 
                 return [
                     {
-                        'type': row[0],
-                        'title': row[1],
-                        'content': row[2][:200] + ('...' if len(row[2]) > 200 else ''),
-                        'severity': row[3],
-                        'recipients_count': row[4],
-                        'successful_sends': row[5],
-                        'failed_sends': row[6],
-                        'created_at': row[7]
+                        'id': row[0],
+                        'type': row[1],
+                        'title': row[2],
+                        'content': row[3],
+                        'content_truncated': bool(row[4]),
+                        'severity': row[5],
+                        'recipients_count': row[6],
+                        'successful_sends': row[7],
+                        'failed_sends': row[8],
+                        'created_at': row[9]
                     } for row in rows
                 ]
                 
@@ -749,9 +1035,7 @@ class Database:
     async def get_regex_keywords(self, enabled_only: bool = True) -> List[Dict[str, Any]]:
         """获取正则关键词列表"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
-                
+            async with self._pooled_connection() as db:
                 query = "SELECT * FROM regex_keywords"
                 if enabled_only:
                     query += " WHERE enabled = TRUE"
@@ -760,7 +1044,9 @@ class Database:
                 cursor = await db.execute(query)
                 rows = await cursor.fetchall()
                 
-                return [dict(row) for row in rows]
+                # 连接会被复用，不修改连接的row_factory，按列名组装字典
+                columns = [column[0] for column in cursor.description]
+                return [dict(zip(columns, row)) for row in rows]
                 
         except Exception as e:
             logger.error(f"获取正则关键词失败: {e}")
@@ -769,7 +1055,7 @@ class Database:
     async def increment_keyword_trigger(self, pattern: str):
         """增加关键词触发计数"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._pooled_connection() as db:
                 await db.execute(
                     "UPDATE regex_keywords SET trigger_count = trigger_count + 1, updated_at = CURRENT_TIMESTAMP WHERE pattern = ?",
                     (pattern,)
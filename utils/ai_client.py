@@ -6,8 +6,12 @@ AI客户端模块
 import asyncio
 import aiohttp
 import base64
+import hashlib
+import time
+import unicodedata
+from collections import OrderedDict
 from io import BytesIO
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
 from PIL import Image
 import google.generativeai as genai
 
@@ -16,12 +20,54 @@ from config import config
 
 logger = get_logger(__name__)
 
+# Gemini返回空回复时的提示（不是真实回答，不应被缓存）
+EMPTY_RESPONSE_MESSAGE = "抱歉，我无法理解您的问题，请尝试重新表述。"
+
+# 归一化问题时去掉的句末标点
+_TRAILING_PUNCTUATION = '?？!！。.'
+
+def _encode_image_base64(image: Union[Image.Image, bytes]) -> str:
+    """将图像编码为base64字符串（PIL图像先转为PNG，CPU密集，应在线程中调用）"""
+    if isinstance(image, Image.Image):
+        img_buffer = BytesIO()
+        image.save(img_buffer, format='PNG')
+        img_data = img_buffer.getvalue()
+    else:
+        img_data = image
+    
+    return base64.b64encode(img_data).decode('utf-8')
+
+def _normalize_question(question: str) -> str:
+    """
+    归一化问题文本，使仅在大小写、全角半角、多余空白和句末标点上不同的问题共享缓存
+    
+    例如 "SillyTavern  怎么安装？" 与 "sillytavern 怎么安装" 得到相同结果，
+    句中的标点和空格（如 "--listen"、"node -v"、"1.2"）保持不变
+    """
+    text = ' '.join(unicodedata.normalize('NFKC', question).casefold().split())
+    # 只去掉一个句末标点（NFKC后全角？！已转为半角）
+    if text and text[-1] in _TRAILING_PUNCTUATION:
+        text = text[:-1].rstrip()
+    return text
+
+def _image_mime_type(image: Union[Image.Image, bytes]) -> str:
+    """获取图像的MIME类型（PIL图像统一编码为PNG，原始字节按文件头判断）"""
+    if isinstance(image, bytes) and image.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    return 'image/png'
+
 class AIClient:
     """AI客户端统一接口"""
     
     def __init__(self):
         self.gemini_client = None
         self.session = None
+        
+        # 问答缓存：键为问题+模型参数的哈希，值为 (写入时间, 回复)，按LRU淘汰
+        self._response_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
         self._setup_clients()
     
     def _setup_clients(self):
@@ -59,14 +105,54 @@ class AIClient:
             logger.error(f"初始化AI客户端失败: {e}")
     
     def get_available_apis(self) -> Dict[str, bool]:
-        """获取可用的API状态"""
+        """获取可用的API状态（仅检查配置，不发起网络请求）"""
+        custom_api = bool(config.CUSTOM_API_ENDPOINT and config.CUSTOM_API_KEY)
+        gemini = bool(config.GEMINI_API_KEY and self.gemini_client)
         return {
-            'custom_api': bool(config.CUSTOM_API_ENDPOINT and config.CUSTOM_API_KEY),
-            'gemini': bool(config.GEMINI_API_KEY and self.gemini_client),
-            'has_any_api': bool(
-                (config.CUSTOM_API_ENDPOINT and config.CUSTOM_API_KEY) or 
-                (config.GEMINI_API_KEY and self.gemini_client)
-            )
+            'custom_api': custom_api,
+            'gemini': gemini,
+            'has_any_api': custom_api or gemini
+        }
+    
+    def get_active_model(self) -> Optional[str]:
+        """获取当前实际使用的模型名称（自定义API优先）"""
+        if config.CUSTOM_API_ENDPOINT and config.CUSTOM_API_KEY:
+            return config.CUSTOM_API_MODEL
+        if self.gemini_client:
+            return config.GEMINI_MODEL
+        return None
+    
+    def _response_cache_key(self, prompt: str, max_tokens: Optional[int], temperature: Optional[float]) -> str:
+        """生成问答缓存键（基于归一化后的问题文本）"""
+        raw = f"{_normalize_question(prompt)}|{self.get_active_model()}|{max_tokens}|{temperature}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """读取未过期的缓存回复"""
+        cached = self._response_cache.get(key)
+        if cached is None:
+            return None
+        
+        if time.monotonic() - cached[0] >= config.AI_RESPONSE_CACHE_TTL:
+            del self._response_cache[key]
+            return None
+        
+        self._response_cache.move_to_end(key)
+        return cached[1]
+    
+    def _cache_response(self, key: str, response: str):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        self._response_cache[key] = (time.monotonic(), response)
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > config.AI_RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """获取问答缓存统计"""
+        return {
+            'cache_size': len(self._response_cache),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses
         }
     
     async def get_session(self) -> aiohttp.ClientSession:
@@ -124,25 +210,40 @@ SillyTavern是一个用于AI聊天的前端界面，常见问题包括：
             AI生成的回复文本
         """
         try:
+            # 纯文本问题先查缓存，相同问题无需再次调用AI
+            cache_key = None
+            if image is None and config.AI_RESPONSE_CACHE_SIZE > 0 and self.get_active_model():
+                cache_key = self._response_cache_key(prompt, max_tokens, temperature)
+                cached = self._get_cached_response(cache_key)
+                if cached is not None:
+                    self.cache_hits += 1
+                    logger.info("命中问答缓存，跳过AI调用")
+                    return cached
+                self.cache_misses += 1
+            
             # 准备SillyTavern专用提示词
             full_prompt = self._prepare_sillytavern_prompt(prompt)
             
             # 优先使用自定义API (OpenAI兼容)
             if config.CUSTOM_API_ENDPOINT and config.CUSTOM_API_KEY:
-                return await self._generate_with_custom_api(full_prompt, image, max_tokens, temperature, user_id)
-            
+                response = await self._generate_with_custom_api(full_prompt, image, max_tokens, temperature, user_id)
             # 备用选择：使用Gemini
-            if self.gemini_client:
-                return await self._generate_with_gemini(full_prompt, image, max_tokens, temperature, user_id)
+            elif self.gemini_client:
+                response = await self._generate_with_gemini(full_prompt, image, max_tokens, temperature, user_id)
+            else:
+                logger.error("没有可用的AI客户端配置")
+                # 记录配置错误
+                await self._record_api_error(
+                    "configuration_error", 
+                    "没有可用的AI客户端配置", 
+                    user_id=user_id
+                )
+                return "抱歉，AI服务暂时不可用，请联系管理员检查配置。"
             
-            logger.error("没有可用的AI客户端配置")
-            # 记录配置错误
-            await self._record_api_error(
-                "configuration_error", 
-                "没有可用的AI客户端配置", 
-                user_id=user_id
-            )
-            return "抱歉，AI服务暂时不可用，请联系管理员检查配置。"
+            # 只缓存真实回复，出错时的提示信息不缓存
+            if cache_key and response and response != EMPTY_RESPONSE_MESSAGE:
+                self._cache_response(cache_key, response)
+            return response
             
         except Exception as e:
             logger.error(f"生成AI回复时发生错误: {e}")
@@ -200,7 +301,7 @@ SillyTavern是一个用于AI聊天的前端界面，常见问题包括：
                     endpoint="gemini",
                     user_id=user_id
                 )
-                return "抱歉，我无法理解您的问题，请尝试重新表述。"
+                return EMPTY_RESPONSE_MESSAGE
                 
         except Exception as e:
             logger.error(f"Gemini生成回复失败: {e}")
@@ -230,15 +331,8 @@ SillyTavern是一个用于AI聊天的前端界面，常见问题包括：
             
             # 如果有图像，添加到消息中
             if image:
-                # 转换图像为base64
-                if isinstance(image, Image.Image):
-                    img_buffer = BytesIO()
-                    image.save(img_buffer, format='PNG')
-                    img_data = img_buffer.getvalue()
-                else:
-                    img_data = image
-                
-                img_base64 = base64.b64encode(img_data).decode('utf-8')
+                # 转换图像为base64（在线程中编码，避免阻塞事件循环）
+                img_base64 = await asyncio.to_thread(_encode_image_base64, image)
                 
                 # 根据API格式调整消息结构
                 messages = [{
@@ -247,7 +341,7 @@ SillyTavern是一个用于AI聊天的前端界面，常见问题包括：
                         {"type": "text", "text": prompt},
                         {
                             "type": "image_url",
-                            "image_url": {"url": f"data:image/png;base64,{img_base64}"}
+                            "image_url": {"url": f"data:{_image_mime_type(image)};base64,{img_base64}"}
                         }
                     ]
                 }]
@@ -4,22 +4,39 @@ API错误监控模块
 """
 
 import asyncio
+import heapq
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from collections import defaultdict, deque
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 
 from utils.logger import get_logger
+from utils.write_queue import WriteBehindQueue
 from database import database
 from config import config
 
 logger = get_logger(__name__)
 
+# 严重程度对应的通知颜色
+_SEVERITY_COLORS = {
+    'critical': 0xFF0000,  # 红色
+    'high': 0xFF8C00,      # 橙色
+    'medium': 0xFFD700,    # 金色
+    'low': 0x87CEEB        # 天蓝色
+}
+
+# 严重程度图标
+_SEVERITY_ICONS = {'critical': '🚨', 'high': '⚠️', 'medium': '🟡', 'low': '🔵'}
+
 class APIErrorMonitor:
     """API错误监控器"""
     
+    # 通过API获取的管理员用户缓存有效期（秒）
+    ADMIN_USER_CACHE_TTL = 600
+    
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.logger = get_logger(self.__class__.__name__)
@@ -41,6 +58,15 @@ class APIErrorMonitor:
         self.notification_cooldown = 300  # 5分钟
         self.last_notifications: Dict[str, datetime] = {}
         
+        # 不在用户缓存中的管理员用户 {用户ID: (获取时间, 用户)}
+        self._admin_user_cache: Dict[int, Tuple[float, discord.User]] = {}
+        
+        # 管理员通知记录写入队列（由后台任务批量写入数据库）
+        self._notification_logs = WriteBehindQueue(
+            "管理员通知记录", database.log_admin_notifications_bulk, max_size=1000
+        )
+        self._notification_logs.start()
+        
     def classify_error_severity(self, error_type: str, error_message: str) -> str:
         """根据错误类型和消息分类错误严重程度"""
         error_lower = error_message.lower()
@@ -167,25 +193,17 @@ class APIErrorMonitor:
             # 创建错误通知嵌入消息
             embed = await self._create_error_notification_embed(error_record, severity, count)
             
-            # 向所有管理员发送私信
-            successful_notifications = 0
-            for admin_id in config.ADMIN_USERS:
-                try:
-                    admin_user = await self.bot.fetch_user(admin_id)
-                    if admin_user:
-                        await admin_user.send(embed=embed)
-                        successful_notifications += 1
-                        self.logger.info(f"已向管理员 {admin_user.display_name} 发送API错误通知")
-                except discord.HTTPException as e:
-                    self.logger.warning(f"向管理员 {admin_id} 发送私信失败: {e}")
-                except Exception as e:
-                    self.logger.error(f"获取管理员用户 {admin_id} 失败: {e}")
+            # 并发向所有管理员发送私信
+            results = await asyncio.gather(
+                *(self._notify_admin(admin_id, embed) for admin_id in config.ADMIN_USERS)
+            )
+            successful_notifications = sum(results)
             
             if successful_notifications > 0:
                 self.logger.info(f"API错误通知已发送给 {successful_notifications} 个管理员")
                 
                 # 记录通知发送
-                await database.log_admin_notification(
+                self.queue_admin_notification(
                     notification_type="api_error",
                     content=f"{error_record['error_type']}: {error_record['error_message'][:100]}",
                     recipients_count=successful_notifications
@@ -196,25 +214,38 @@ class APIErrorMonitor:
         except Exception as e:
             self.logger.error(f"发送管理员通知时发生异常: {e}")
     
+    async def _resolve_admin_user(self, admin_id: int) -> discord.User:
+        """获取管理员用户，优先使用机器人用户缓存，其次使用本地缓存，均未命中时才请求API"""
+        user = self.bot.get_user(admin_id)
+        if user is not None:
+            return user
+        
+        cached = self._admin_user_cache.get(admin_id)
+        if cached and time.monotonic() - cached[0] < self.ADMIN_USER_CACHE_TTL:
+            return cached[1]
+        
+        user = await self.bot.fetch_user(admin_id)
+        self._admin_user_cache[admin_id] = (time.monotonic(), user)
+        return user
+    
+    async def _notify_admin(self, admin_id: int, embed: discord.Embed) -> bool:
+        """向单个管理员发送私信通知，返回是否发送成功"""
+        try:
+            admin_user = await self._resolve_admin_user(admin_id)
+            await admin_user.send(embed=embed)
+            self.logger.info(f"已向管理员 {admin_user.display_name} 发送API错误通知")
+            return True
+        except discord.HTTPException as e:
+            self.logger.warning(f"向管理员 {admin_id} 发送私信失败: {e}")
+        except Exception as e:
+            self.logger.error(f"获取管理员用户 {admin_id} 失败: {e}")
+        return False
+    
     async def _create_error_notification_embed(self, error_record: Dict, severity: str, count: int) -> discord.Embed:
         """创建错误通知嵌入消息"""
-        # 根据严重程度选择颜色
-        colors = {
-            'critical': 0xFF0000,  # 红色
-            'high': 0xFF8C00,      # 橙色
-            'medium': 0xFFD700,    # 金色
-            'low': 0x87CEEB        # 天蓝色
-        }
-        color = colors.get(severity, 0x87CEEB)
-        
-        # 严重程度图标
-        severity_icons = {
-            'critical': '🚨',
-            'high': '⚠️',
-            'medium': '🟡',
-            'low': '🔵'
-        }
-        icon = severity_icons.get(severity, '🔵')
+        # 根据严重程度选择颜色和图标
+        color = _SEVERITY_COLORS.get(severity, 0x87CEEB)
+        icon = _SEVERITY_ICONS.get(severity, '🔵')
         
         embed = discord.Embed(
             title=f"{icon} API错误监控警报",
@@ -264,9 +295,10 @@ class APIErrorMonitor:
         # 用户信息
         if error_record.get('user_id'):
             try:
-                user = await self.bot.fetch_user(error_record['user_id'])
-                user_info = f"{user.display_name} (`{user.id}`)" if user else f"Unknown (`{error_record['user_id']}`)"
-            except:
+                # 优先使用用户缓存，未命中时才请求API
+                user = self.bot.get_user(error_record['user_id']) or await self.bot.fetch_user(error_record['user_id'])
+                user_info = f"{user.display_name} (`{user.id}`)"
+            except discord.HTTPException:
                 user_info = f"Unknown (`{error_record['user_id']}`)"
             
             embed.add_field(
@@ -277,9 +309,9 @@ class APIErrorMonitor:
         
         # 附加信息
         if error_record.get('additional_info'):
-            info_text = ""
-            for key, value in error_record['additional_info'].items():
-                info_text += f"**{key}**: {value}\n"
+            info_text = "\n".join(
+                f"**{key}**: {value}" for key, value in error_record['additional_info'].items()
+            )
             
             if info_text:
                 embed.add_field(
@@ -327,6 +359,33 @@ class APIErrorMonitor:
         
         return "• 查看详细日志信息\n• 参考API文档\n• 必要时联系技术支持"
     
+    def queue_admin_notification(
+        self,
+        notification_type: str,
+        content: str,
+        title: Optional[str] = None,
+        severity: str = 'medium',
+        recipients_count: int = 0,
+        successful_sends: int = 0,
+        failed_sends: int = 0
+    ):
+        """将管理员通知记录加入写入队列"""
+        self._notification_logs.append((
+            notification_type, title, content, severity,
+            recipients_count, successful_sends, failed_sends
+        ))
+    
+    async def close(self):
+        """停止写入任务（等待进行中的写入完成）并写入剩余的通知记录"""
+        await self._notification_logs.close()
+    
+    def stats_snapshot(self) -> Dict[str, int]:
+        """获取错误计数概览（O(1)，不遍历错误记录）"""
+        return {
+            'recent_errors': len(self.recent_errors),
+            'error_types': len(self.error_counts)
+        }
+    
     async def get_error_statistics(self) -> Dict:
         """获取错误统计信息"""
         try:
@@ -334,38 +393,35 @@ class APIErrorMonitor:
             hour_ago = now - timedelta(hours=1)
             day_ago = now - timedelta(days=1)
             
-            # 统计最近1小时和24小时的错误
-            recent_hour_errors = [
-                err for err in self.recent_errors 
-                if err['timestamp'] >= hour_ago
-            ]
-            recent_day_errors = [
-                err for err in self.recent_errors 
-                if err['timestamp'] >= day_ago
-            ]
-            
-            # 按类型统计
+            # 单次遍历统计最近1小时和24小时的错误
+            # recent_errors按时间顺序追加，从最新的记录倒序遍历，超出24小时即可停止
+            hour_count = 0
+            day_count = 0
             hour_by_type = defaultdict(int)
             day_by_type = defaultdict(int)
             
-            for err in recent_hour_errors:
-                hour_by_type[err['error_type']] += 1
-            
-            for err in recent_day_errors:
+            for err in reversed(self.recent_errors):
+                timestamp = err['timestamp']
+                if timestamp < day_ago:
+                    break
+                day_count += 1
                 day_by_type[err['error_type']] += 1
+                if timestamp >= hour_ago:
+                    hour_count += 1
+                    hour_by_type[err['error_type']] += 1
             
             return {
                 'total_errors': len(self.recent_errors),
                 'last_hour': {
-                    'count': len(recent_hour_errors),
+                    'count': hour_count,
                     'by_type': dict(hour_by_type)
                 },
                 'last_day': {
-                    'count': len(recent_day_errors),
+                    'count': day_count,
                     'by_type': dict(day_by_type)
                 },
                 'most_common_errors': dict(
-                    sorted(self.error_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+                    heapq.nlargest(10, self.error_counts.items(), key=lambda x: x[1])
                 )
             }
             
@@ -0,0 +1,22 @@
+"""
+命令检查模块
+提供斜杠命令共用的权限检查装饰器
+"""
+
+import discord
+from discord import app_commands
+
+from config import config
+
+def _is_admin(interaction: discord.Interaction) -> bool:
+    """检查交互用户是否为管理员"""
+    return config.is_admin_user(interaction.user.id)
+
+def admin_required():
+    """
+    斜杠命令管理员权限检查装饰器
+    
+    检查未通过时抛出app_commands.CheckFailure，由全局错误处理统一发送权限不足提示，
+    命令本身不会被执行
+    """
+    return app_commands.check(_is_admin)
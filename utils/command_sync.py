@@ -0,0 +1,87 @@
+"""
+斜杠命令同步模块
+根据命令树哈希判断是否需要向Discord同步斜杠命令，避免每次重连都重复同步
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 上次成功同步时的命令树哈希
+HASH_FILE = Path(".command_tree_hash")
+
+def _command_payload(command: Any, tree: app_commands.CommandTree) -> Dict[str, Any]:
+    """获取命令的序列化数据（兼容新旧版本discord.py的to_dict签名）"""
+    try:
+        return command.to_dict(tree)
+    except TypeError:
+        return command.to_dict()
+
+def compute_tree_hash(bot: commands.Bot, guild_id: Optional[int] = None) -> str:
+    """计算当前已注册命令树的哈希（同步目标服务器不同时哈希也不同）"""
+    tree = bot.tree
+    payload = {
+        'application_id': bot.application_id,
+        'guild_id': guild_id,
+        'commands': [_command_payload(command, tree) for command in tree.get_commands()]
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def _read_saved_hash() -> Optional[str]:
+    """读取上次同步时保存的哈希"""
+    try:
+        return HASH_FILE.read_text(encoding='utf-8').strip() or None
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"读取命令树哈希失败: {e}")
+        return None
+
+def _write_saved_hash(tree_hash: str):
+    """保存本次同步的哈希"""
+    try:
+        HASH_FILE.write_text(tree_hash, encoding='utf-8')
+    except OSError as e:
+        logger.warning(f"保存命令树哈希失败: {e}")
+
+async def sync_command_tree(
+    bot: commands.Bot,
+    force: bool = False,
+    guild_id: Optional[int] = None
+) -> Optional[int]:
+    """
+    同步斜杠命令
+
+    Args:
+        bot: 机器人实例
+        force: 是否忽略哈希强制同步
+        guild_id: 开发服务器ID，指定时将全局命令复制到该服务器并仅同步该服务器（立即生效）
+
+    Returns:
+        同步的命令数量；命令树未变化而跳过同步时返回None
+    """
+    tree_hash = compute_tree_hash(bot, guild_id)
+
+    if not force and _read_saved_hash() == tree_hash:
+        logger.info("斜杠命令未变化，跳过同步")
+        return None
+
+    if guild_id:
+        guild = discord.Object(id=guild_id)
+        bot.tree.copy_global_to(guild=guild)
+        synced = await bot.tree.sync(guild=guild)
+        logger.info(f"已同步斜杠命令到开发服务器 {guild_id}")
+    else:
+        synced = await bot.tree.sync()
+    _write_saved_hash(tree_hash)
+    return len(synced)
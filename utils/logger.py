@@ -95,3 +95,21 @@ def get_logger(name: str, level: str = 'INFO') -> logging.Logger:
         日志记录器
     """
     return setup_logger(name, level)
+
+def truncate_traceback(tb: Optional[str], max_chars: int = 8192) -> Optional[str]:
+    """
+    截断过长的堆栈信息，保留开头和结尾部分
+    
+    Args:
+        tb: 堆栈信息文本
+        max_chars: 最大字符数
+    
+    Returns:
+        截断后的堆栈信息
+    """
+    if not tb or len(tb) <= max_chars:
+        return tb
+    
+    half = max_chars // 2
+    omitted = len(tb) - half * 2
+    return f"{tb[:half]}\n... [已截断 {omitted} 个字符] ...\n{tb[-half:]}"
@@ -5,7 +5,6 @@
 
 import discord
 import asyncio
-from datetime import datetime
 from typing import List, Optional, Dict, Any, Union
 from enum import Enum
 
@@ -70,7 +69,7 @@ class EmbedFormatter:
             embed = discord.Embed(
                 title=f"💡 SillyTavern 解答",
                 color=EmbedFormatter.COLORS[MessageType.SOLUTION],
-                timestamp=datetime.utcnow()
+                timestamp=discord.utils.utcnow()
             )
             
             # 简化显示，不分页，直接截取
@@ -100,7 +99,7 @@ class EmbedFormatter:
             title=f"{EmbedFormatter.EMOJIS[MessageType.SOLUTION]} SillyTavern 智能助手",
             description=f"为 **{user_name}** 提供的解答",
             color=EmbedFormatter.COLORS[MessageType.SOLUTION],
-            timestamp=datetime.utcnow()
+            timestamp=discord.utils.utcnow()
         )
         
         # 添加问题字段
@@ -158,7 +157,7 @@ class EmbedFormatter:
             title=f"{EmbedFormatter.EMOJIS[MessageType.ERROR]} {title}",
             description=error_message,
             color=EmbedFormatter.COLORS[MessageType.ERROR],
-            timestamp=datetime.utcnow()
+            timestamp=discord.utils.utcnow()
         )
         
         if user_name:
@@ -178,7 +177,27 @@ class EmbedFormatter:
             title=f"{EmbedFormatter.EMOJIS[MessageType.SUCCESS]} {title}",
             description=message,
             color=EmbedFormatter.COLORS[MessageType.SUCCESS],
-            timestamp=datetime.utcnow()
+            timestamp=discord.utils.utcnow()
+        )
+        
+        if user_name:
+            embed.set_footer(text=f"用户: {user_name}")
+        
+        return embed
+    
+    @staticmethod
+    def create_info_embed(
+        message: str,
+        title: str = "提示",
+        user_name: str = None
+    ) -> discord.Embed:
+        """创建提示消息嵌入"""
+        
+        embed = discord.Embed(
+            title=f"{EmbedFormatter.EMOJIS[MessageType.INFO]} {title}",
+            description=message,
+            color=EmbedFormatter.COLORS[MessageType.INFO],
+            timestamp=discord.utils.utcnow()
         )
         
         if user_name:
@@ -194,7 +213,7 @@ class EmbedFormatter:
             title=f"{EmbedFormatter.EMOJIS[MessageType.INFO]} SillyTavern 问答机器人帮助",
             description="我是专门为SillyTavern用户提供技术支持的AI助手！",
             color=EmbedFormatter.COLORS[MessageType.INFO],
-            timestamp=datetime.utcnow()
+            timestamp=discord.utils.utcnow()
         )
         
         embed.add_field(
@@ -228,6 +247,44 @@ class EmbedFormatter:
         
         return embed
     
+    @staticmethod
+    def clone_help_embed() -> discord.Embed:
+        """复制预构建的帮助信息嵌入（模板仅在模块加载时构建一次）"""
+        embed = _HELP_EMBED_TEMPLATE.copy()
+        embed.timestamp = discord.utils.utcnow()
+        return embed
+    
+    @staticmethod
+    def clone_error_embed(
+        title: str,
+        error_message: str = None,
+        user_name: str = None
+    ) -> discord.Embed:
+        """
+        基于缓存模板创建错误消息嵌入
+        
+        Args:
+            title: 错误标题（同时作为模板缓存键）
+            error_message: 错误描述，为空时沿用模板中的描述
+            user_name: 用户名称
+        
+        Returns:
+            错误消息嵌入
+        """
+        template = _ERROR_EMBED_TEMPLATES.get(title)
+        if template is None:
+            template = EmbedFormatter.create_error_embed(error_message or "", title=title)
+            _ERROR_EMBED_TEMPLATES[title] = template
+        
+        embed = template.copy()
+        embed.timestamp = discord.utils.utcnow()
+        if error_message is not None:
+            embed.description = error_message
+        if user_name:
+            embed.set_footer(text=f"用户: {user_name}")
+        
+        return embed
+    
     @staticmethod 
     def create_detailed_help_pages() -> List[str]:
         """创建详细帮助信息的分页内容"""
@@ -343,7 +400,7 @@ class EmbedFormatter:
         embed = discord.Embed(
             title=f"{EmbedFormatter.EMOJIS[MessageType.INFO]} 机器人状态",
             color=EmbedFormatter.COLORS[MessageType.INFO],
-            timestamp=datetime.utcnow()
+            timestamp=discord.utils.utcnow()
         )
         
         embed.add_field(name="🤖 AI状态", value=ai_status, inline=True)
@@ -501,3 +558,13 @@ class EmbedFormatter:
         except (discord.Forbidden, discord.HTTPException) as e:
             print(f"发送消息失败: {e}")
             return None
+
+# 预构建的静态嵌入模板，使用时复制后只修改与用户相关的字段
+_HELP_EMBED_TEMPLATE = EmbedFormatter.create_help_embed()
+
+_ERROR_EMBED_TEMPLATES: Dict[str, discord.Embed] = {
+    "权限不足": EmbedFormatter.create_error_embed("您没有足够的权限使用此命令。", title="权限不足"),
+    "参数错误": EmbedFormatter.create_error_embed("", title="参数错误"),
+    "系统错误": EmbedFormatter.create_error_embed("执行命令时发生了意外错误，请稍后再试。", title="系统错误"),
+    "命令错误": EmbedFormatter.create_error_embed("", title="命令错误"),
+}
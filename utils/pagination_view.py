@@ -5,7 +5,6 @@
 
 import discord
 from typing import List, Optional
-from datetime import datetime, timedelta
 
 from utils.message_formatter import EmbedFormatter, MessageType
 
@@ -42,7 +41,7 @@ class PaginationView(discord.ui.View):
             title=f"{EmbedFormatter.EMOJIS[MessageType.SOLUTION]} SillyTavern 智能助手",
             description=f"为 **{self.user_name}** 提供的解答",
             color=EmbedFormatter.COLORS[MessageType.SOLUTION],
-            timestamp=datetime.utcnow()
+            timestamp=discord.utils.utcnow()
         )
         
         # 添加问题字段
@@ -0,0 +1,108 @@
+"""
+批量写入队列模块
+暂存待写入数据库的记录，由后台任务定期批量写入，避免阻塞业务流程
+"""
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, List, Tuple
+
+from discord.ext import tasks
+
+from utils.logger import get_logger
+from database import database
+
+logger = get_logger(__name__)
+
+class WriteBehindQueue:
+    """
+    批量写入队列
+    
+    记录先加入内存队列，由后台任务每秒调用一次批量写入方法（返回写入条数，失败返回0）。
+    写入失败的记录放回队首等待下次重试；队列超过容量时丢弃最旧的记录并输出警告。
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        write_bulk: Callable[[List[Tuple]], Awaitable[int]],
+        max_size: int,
+        interval: float = 1.0
+    ):
+        """
+        Args:
+            name: 队列名称（用于日志）
+            write_bulk: 批量写入方法
+            max_size: 队列最大记录数
+            interval: 后台写入间隔（秒）
+        """
+        self.name = name
+        self.max_size = max_size
+        self.dropped = 0
+        self._write_bulk = write_bulk
+        self._rows: deque = deque()
+        self._overflowing = False
+        self._writer = tasks.loop(seconds=interval)(self.flush)
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def append(self, row: Tuple):
+        """加入一条待写入的记录"""
+        self._rows.append(row)
+        self._trim()
+    
+    def _trim(self):
+        """超过容量时丢弃最旧的记录（每次溢出只警告一次，写入成功后重置）"""
+        overflow = len(self._rows) - self.max_size
+        if overflow <= 0:
+            return
+        
+        for _ in range(overflow):
+            self._rows.popleft()
+        self.dropped += overflow
+        
+        if not self._overflowing:
+            self._overflowing = True
+            logger.warning(f"{self.name}写入队列已满 ({self.max_size} 条)，开始丢弃最旧的记录")
+    
+    async def flush(self) -> int:
+        """将队列中的记录批量写入数据库，返回写入的记录数（数据库未就绪时保留在队列中）"""
+        if not self._rows or not database.is_ready:
+            return 0
+        
+        rows = list(self._rows)
+        self._rows.clear()
+        
+        try:
+            written = await self._write_bulk(rows)
+        except Exception as e:
+            logger.error(f"批量写入{self.name}失败: {e}")
+            written = 0
+        
+        if not written:
+            # 放回队首（写入期间新加入的记录排在其后），下次重试
+            self._rows.extendleft(reversed(rows))
+            self._trim()
+            return 0
+        
+        if self._overflowing:
+            self._overflowing = False
+            logger.warning(f"{self.name}写入队列已恢复，累计丢弃 {self.dropped} 条记录")
+        return written
+    
+    def start(self):
+        """启动后台写入任务"""
+        self._writer.start()
+    
+    async def close(self):
+        """停止后台写入任务（等待进行中的写入完成）并写入剩余记录"""
+        task = self._writer.get_task()
+        if task and not task.done():
+            # stop()会让当前一轮写入正常结束，cancel()可能中断写入导致记录丢失
+            self._writer.stop()
+            await asyncio.wait({task})
+        
+        await self.flush()
+        if self._rows:
+            logger.warning(f"关闭时仍有 {len(self._rows)} 条{self.name}未能写入数据库")